@@ -1,2 +1,4 @@
 
-__version__ = '0.5'
+from basepy._version import __version__
+
+__all__ = ['__version__']
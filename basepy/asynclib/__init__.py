@@ -1 +1,19 @@
+import asyncio
 
+
+def install_eager_tasks(loop=None):
+    """Use asyncio.eager_task_factory on the loop (Python 3.12+).
+
+    Coroutines that finish without suspending then complete without being
+    scheduled. A task factory already set on the loop is left in place.
+    This changes scheduling for every task on the loop, so it is an opt-in
+    for the application, the library never calls it.
+    """
+    factory = getattr(asyncio, 'eager_task_factory', None)
+    if factory is None:
+        return False
+    if loop is None:
+        loop = asyncio.get_running_loop()
+    if loop.get_task_factory() is None:
+        loop.set_task_factory(factory)
+    return loop.get_task_factory() is factory
@@ -13,35 +13,80 @@ from basepy.asynclog import logger
 try:
     import contextvars
 
-    def context_partial(func, *args, **kwargs):
+    def context_partial(func, *args, _copy=True, **kwargs):
+        """
+        Bind ``func`` to a copy of the current context. With ``_copy=False``
+        the copy is skipped and ``func`` runs in the worker thread's own
+        context, losing per call context isolation.
+        """
+        if not _copy:
+            return partial(func, *args, **kwargs)
         context = contextvars.copy_context()
         return partial(context.run, func, *args, **kwargs)
 
 except ImportError:
-    context_partial = partial
+    def context_partial(func, *args, _copy=True, **kwargs):
+        return partial(func, *args, **kwargs)
+
+
+_MISSING = object()
+
+
+def forward_partial(func, forward_vars, *args, **kwargs):
+    """
+    Bind ``func`` to the current values of the ``forward_vars`` context
+    variables only. The worker sets them before calling ``func`` and resets
+    them afterwards, so nothing leaks into later calls on the same thread.
+    """
+    values = [(var, var.get(_MISSING)) for var in forward_vars]
+
+    def run():
+        tokens = [var.set(value) for var, value in values
+                  if value is not _MISSING]
+        try:
+            return func(*args, **kwargs)
+        finally:
+            for token in reversed(tokens):
+                token.var.reset(token)
+
+    return run
 
 
 def run_in_executor(func, executor=None, args=(),
-                    kwargs=MappingProxyType({})) -> asyncio.Future:
+                    kwargs=MappingProxyType({}),
+                    copy_context=True) -> asyncio.Future:
 
-    loop = asyncio.get_event_loop()
+    loop = asyncio.get_running_loop()
     # noinspection PyTypeChecker
     return loop.run_in_executor(
-        executor, context_partial(func, *args, **kwargs)
+        executor, context_partial(func, *args, _copy=copy_context, **kwargs)
     )
 
 
 async def _awaiter(future):
-    try:
-        result = await future
-        return result
-    except asyncio.CancelledError as e:
-        if not future.done():
-            future.set_exception(e)
-        raise
+    # Cancelling the awaiting task already cancels ``future``, no extra
+    # handling is needed here.
+    return await future
 
 
-def threaded(func):
+def threaded(func=None, *, copy_context=True, forward_vars=None):
+    """
+    Run a blocking function in the loop's default executor.
+
+    The call is submitted as soon as the decorated function is called, in
+    the caller's context, and a coroutine awaiting the executor future is
+    returned. Cancelling the awaiting task cancels that future, so work
+    which has not started yet is dropped.
+
+    Use ``@threaded(copy_context=False)`` for hot functions which do not
+    read context variables, to skip copying the context on every call.
+    ``@threaded(forward_vars=(var, ...))`` forwards just the given context
+    variables instead of a copy of the whole context.
+    """
+    if func is None:
+        return partial(threaded, copy_context=copy_context,
+                       forward_vars=forward_vars)
+
     if asyncio.iscoroutinefunction(func):
         raise TypeError('Can not wrap coroutine')
 
@@ -50,16 +95,19 @@ def threaded(func):
 
     @wraps(func)
     def wrap(*args, **kwargs):
-        future = run_in_executor(func=func, args=args, kwargs=kwargs)
-        result = _awaiter(future)
-        return result
+        if forward_vars:
+            target = forward_partial(func, forward_vars, *args, **kwargs)
+        else:
+            target = context_partial(func, *args, _copy=copy_context, **kwargs)
+        future = asyncio.get_running_loop().run_in_executor(None, target)
+        return _awaiter(future)
 
     return wrap
 
 
 def run_in_new_thread(func, args=(), kwargs=MappingProxyType({}),
                       detouch=True, no_return=False) -> asyncio.Future:
-    loop = asyncio.get_event_loop()
+    loop = asyncio.get_running_loop()
     future = loop.create_future()
 
     def set_result(result):
@@ -129,31 +177,16 @@ class CoroutineWaiter:
                  *args, **kwargs):
         self.__func = partial(coroutine_func, *args, **kwargs)
         self.__loop = loop
-        self.__event = threading.Event()
-        self.__result = None
-        self.__exception = None
-
-    def _on_result(self, task: asyncio.Task):
-        self.__exception = task.exception()
-        if self.__exception is None:
-            self.__result = task.result()
-        self.__event.set()
-
-    def _awaiter(self):
-        task = self.__loop.create_task(self.__func())
-        task.add_done_callback(self._on_result)
+        self._fut = None
 
     def start(self):
-        self.__loop.call_soon_threadsafe(self._awaiter)
+        self._fut = asyncio.run_coroutine_threadsafe(self.__func(), self.__loop)
 
     def wait(self):
-        self.__event.wait()
-        if self.__exception is not None:
-            raise self.__exception
-        return self.__result
+        return self._fut.result()
 
 
 def sync_wait_coroutine(loop, coro_func, *args, **kwargs):
-    waiter = CoroutineWaiter(loop, coro_func, *args, **kwargs)
-    waiter.start()
-    return waiter.wait()
\ No newline at end of file
+    return asyncio.run_coroutine_threadsafe(
+        coro_func(*args, **kwargs), loop
+    ).result()
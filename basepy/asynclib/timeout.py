@@ -1,6 +1,5 @@
 import asyncio
 from functools import wraps
-from typing import Union, TypeVar
 
 def timeout(value):
     def decorator(func):
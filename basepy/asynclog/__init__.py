@@ -7,17 +7,24 @@ import os
 import platform
 import json
 import pprint
+import inspect
+import socket
+import functools
 from copy import copy
 from basepy.asynclib import datagram
-from basepy.common.log import LoggerLevel, LogRecord, BaseHandler
+from basepy.common.log import LoggerLevel, LogRecord, BaseHandler, _dumps
+
+async def _done():
+    """A finished coroutine, so callers can still await or schedule it."""
+
 
 class StdoutHandler(BaseHandler):
     terminator = '\n'
+    is_async = False
     def __init__(self, stream=None, format=None, level="DEBUG", **kwargs):
-        if stream is None:
-            stream = sys.stdout
-        self.stream = stream
-        self.isatty = stream.isatty()
+        # None writes to whatever sys.stdout is at the time of the write
+        self._stream = stream
+        self.isatty = self.stream.isatty()
         self.format_str = "[{created}] [{hostname}.{process}] [{level}] [{name}] [{message}]"
         self.level = level
         self.levelno = LoggerLevel.get_levelno(self.level, 0)
@@ -27,6 +34,17 @@ class StdoutHandler(BaseHandler):
         if self.stream and hasattr(self.stream, "flush"):
             self.stream.flush()
 
+    @property
+    def stream(self):
+        if self._stream is None:
+            return sys.stdout
+        return self._stream
+
+    def reset_buffer(self):
+        """Flush the stream and forget state derived from an earlier one."""
+        self.flush()
+        self.isatty = self.stream.isatty()
+
     async def emit(self, record):
         try:
             msg = self.make_message(record)
@@ -45,6 +63,19 @@ class StdoutHandler(BaseHandler):
         except Exception:
             self.handle_error(record)
 
+    async def emit_many(self, records):
+        msgs = []
+        for record in records:
+            try:
+                msgs.append(self.make_message(record) + self.terminator)
+            except Exception:
+                self.handle_error(record)
+        try:
+            self.stream.write(''.join(msgs))
+            self.flush()
+        except Exception:
+            self.handle_error(records[-1])
+
     def make_message(self, record):
         data = record.to_dict()
         data['created'] = time.strftime("%Y-%m-%d %H:%M:%S %z", time.localtime(data['created']))
@@ -66,8 +97,17 @@ class StdoutHandler(BaseHandler):
             name += ' '
         return '<%s %s(%s)>' % (self.__class__.__name__, name, level)
 
+@functools.lru_cache(maxsize=128)
+def _resolve(host, port, socktype):
+    """Resolve host and port once, return (family, socktype, proto, sockaddr)."""
+    family, socktype, proto, _, sockaddr = socket.getaddrinfo(
+        host, port, type=socktype)[0]
+    return family, socktype, proto, sockaddr
+
+
 class SocketHandler(BaseHandler):
     terminator = '\n'
+    is_async = True
     def __init__(self, host="127.0.0.1", port=514, connection_type="TCP", level="DEBUG", **kwargs):
         self.host = host
         self.port = port
@@ -84,16 +124,36 @@ class SocketHandler(BaseHandler):
     def flush(self):
         pass
 
+    def refresh_dns(self):
+        """Forget resolved addresses and reconnect on the next write."""
+        _resolve.cache_clear()
+        for sock in (self.tcp_socket, self.udp_socket):
+            if sock is not None:
+                sock.close()
+        if self.tcp_writer is not None:
+            self.tcp_writer.close()
+        if self.udp_stream is not None:
+            self.udp_stream.close()
+        self.tcp_writer = self.udp_stream = None
+        self.tcp_socket = self.udp_socket = None
+
+    async def _resolve_async(self, socktype):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, _resolve, self.host, self.port, socktype)
+
     async def _write_tcp(self, data):
         if self.tcp_writer is None:
-            _, writer = await asyncio.open_connection(self.host, self.port)
+            sockaddr = (await self._resolve_async(socket.SOCK_STREAM))[3]
+            _, writer = await asyncio.open_connection(sockaddr[0], sockaddr[1])
             self.tcp_writer = writer
         self.tcp_writer.write(data)
         await self.tcp_writer.drain()
 
     async def _write_udp(self, data):
         if self.udp_stream is None:
-            writer = datagram.connect((self.host, self.port))
+            sockaddr = (await self._resolve_async(socket.SOCK_DGRAM))[3]
+            writer = await datagram.connect(sockaddr[:2])
             self.udp_stream = writer
         await self.udp_stream.send(data)
 
@@ -105,22 +165,30 @@ class SocketHandler(BaseHandler):
 
     async def emit(self, record):
         try:
-            msg = "{}{}".format(json.dumps(record.to_dict()), self.terminator)
+            msg = "{}{}".format(_dumps(record.to_dict()), self.terminator)
             await self._write(msg.encode("utf-8"))
         except Exception:
             self.handle_error(record)
 
+    def _connect_sync(self, socktype):
+        family, socktype, proto, sockaddr = _resolve(self.host, self.port, socktype)
+        sock = socket.socket(family, socktype, proto)
+        try:
+            sock.connect(sockaddr)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
     def _write_tcp_sync(self, data):
         if self.tcp_socket is None:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.connect((self.host, self.port))
-                self.tcp_socket = s
+            self.tcp_socket = self._connect_sync(socket.SOCK_STREAM)
         self.tcp_socket.sendall(data)
 
     def _write_udp_sync(self, data):
         if self.udp_socket is None:
-            self.udp_socket = socket.socket(family=socket.AF_INET, type=socket.SOCK_DGRAM)
-        self.udp_socket.sendto(data)
+            self.udp_socket = self._connect_sync(socket.SOCK_DGRAM)
+        self.udp_socket.send(data)
 
     def _write_sync(self, data):
         if self.connection_type.upper() == "TCP":
@@ -130,7 +198,7 @@ class SocketHandler(BaseHandler):
 
     def emit_sync(self, record):
         try:
-            msg = "{}{}".format(json.dumps(record.to_dict()), self.terminator)
+            msg = "{}{}".format(_dumps(record.to_dict()), self.terminator)
             self._write_sync(msg.encode("utf-8"))
         except Exception:
             self.handle_error(record)
@@ -150,6 +218,11 @@ class AsyncLoggerEngine:
         self.dev_mode = True
         self.min_levelno = LoggerLevel.CRITICAL
         self.hostname = platform.node()
+        # True when no handler needs the event loop, see AsyncLogger.log
+        self.all_sync = True
+        # records queued by the *_nowait methods, drained by a background task
+        self._queue = None
+        self._drain_task = None
 
     @classmethod
     def register_handler(cls, name, handler_cls):
@@ -176,9 +249,11 @@ class AsyncLoggerEngine:
             self.min_levelno = levelno
         h = h_cls(format=log_format, level=level, **kwargs)
         self.handlers.append(h)
+        self.all_sync = self.all_sync and not getattr(h, 'is_async', True)
 
     def clear(self):
         self.handlers = []
+        self.all_sync = True
 
     def _filter_handlers(self, level):
         levelno = LoggerLevel.get_levelno(level)
@@ -205,6 +280,54 @@ class AsyncLoggerEngine:
             for handler in self.handlers:
                 await handler.emit(record)
 
+    def log_nowait(self, name, level, message, args, kwargs):
+        handlers = self._filter_handlers(level)
+        if len(handlers) == 0:
+            return None
+        exc_info = kwargs.pop('exc_info', None)
+        record = LogRecord(name, level, message, args, exc_info, None, **kwargs)
+        if self._drain_task is None or self._drain_task.done():
+            self._queue = asyncio.Queue()
+            self._drain_task = asyncio.get_running_loop().create_task(self._drain())
+        self._queue.put_nowait(record)
+
+    async def _drain(self):
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                # a failing handler must not stop the drain task, records
+                # queued behind it and flush() waiters depend on it
+                for handler in self.handlers:
+                    emit_many = getattr(handler, 'emit_many', None)
+                    if emit_many is not None:
+                        try:
+                            await emit_many(batch)
+                        except Exception:
+                            handler.handle_error(batch[-1])
+                        continue
+                    for record in batch:
+                        try:
+                            await handler.emit(record)
+                        except Exception:
+                            handler.handle_error(record)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def flush(self):
+        """Wait until all queued records are handled and flush the handlers."""
+        if self._drain_task is not None and not self._drain_task.done():
+            await self._queue.join()
+        for handler in self.handlers:
+            flush = getattr(handler, 'flush', None)
+            # handlers writing asynchronously return an awaitable
+            result = flush() if flush is not None else None
+            if inspect.isawaitable(result):
+                await result
+
 class SyncLogger:
     def __init__(self, name="", engine=None, **kwargs):
         self.name = name
@@ -289,39 +412,84 @@ class AsyncLogger(object):
         new_kwargs.update(kwargs)
         return AsyncLogger(name, self.engine, **new_kwargs)
 
-    async def log(self, level, message, args, kwargs):
+    def log(self, level, message, args, kwargs):
         merged_args = copy(self.kwargs)
         merged_args.update(kwargs)
-        await self.engine.log(self.name, level, message, args, merged_args)
+        if self.engine.all_sync:
+            # every handler writes synchronously, emit before returning
+            self.engine.log_sync(self.name, level, message, args, merged_args)
+            return _done()
+        return self.engine.log(self.name, level, message, args, merged_args)
+
+    def log_nowait(self, level, message, args, kwargs):
+        merged_args = copy(self.kwargs)
+        merged_args.update(kwargs)
+        self.engine.log_nowait(self.name, level, message, args, merged_args)
+
+    async def flush(self):
+        await self.engine.flush()
+
+    def debug(self, message, *args, **kwargs):
+        if not self.engine.dev_mode: return _done()
+        return self.log('DEBUG', message, args, kwargs)
+
+    def info(self, message, *args, **kwargs):
+        if self.engine.min_levelno > LoggerLevel.INFO: return _done()
+        return self.log('INFO', message, args, kwargs)
+
+    def warning(self, message, *args, **kwargs):
+        if self.engine.min_levelno > LoggerLevel.WARNING: return _done()
+        return self.log('WARNING', message, args, kwargs)
+
+    def error(self, message, *args, **kwargs):
+        if self.engine.min_levelno > LoggerLevel.ERROR: return _done()
+        exc_info = kwargs.pop('exc_info', None)
+        if exc_info:
+            kwargs['exc_info'] = sys.exc_info()
+        return self.log('ERROR', message, args, kwargs)
+
+    def critical(self, message, *args, **kwargs):
+        if self.engine.min_levelno > LoggerLevel.CRITICAL: return _done()
+        exc_info = kwargs.pop('exc_info', None)
+        if exc_info:
+            kwargs['exc_info'] = sys.exc_info()
+        return self.log('CRITICAL', message, args, kwargs)
+
+    def exception(self, message, *args, **kwargs):
+        kwargs.pop('exc_info', None)
+        return self.error(message, *args, exc_info=True, **kwargs)
 
-    async def debug(self, message, *args, **kwargs):
+    # The *_nowait methods queue the record and return without awaiting,
+    # a background task hands queued records to the handlers in batches.
+    # Use ``await logger.flush()`` to wait until they are written.
+    def debug_nowait(self, message, *args, **kwargs):
         if self.engine.dev_mode:
-            await self.log('DEBUG', message, args, kwargs)
+            self.log_nowait('DEBUG', message, args, kwargs)
 
-    async def info(self, message, *args, **kwargs):
+    def info_nowait(self, message, *args, **kwargs):
         if self.engine.min_levelno > LoggerLevel.INFO: return
-        await self.log('INFO', message, args, kwargs)
+        self.log_nowait('INFO', message, args, kwargs)
 
-    async def warning(self, message, *args, **kwargs):
+    def warning_nowait(self, message, *args, **kwargs):
         if self.engine.min_levelno > LoggerLevel.WARNING: return
-        await self.log('WARNING', message, args, kwargs)
+        self.log_nowait('WARNING', message, args, kwargs)
 
-    async def error(self, message, *args, **kwargs):
+    def error_nowait(self, message, *args, **kwargs):
         if self.engine.min_levelno > LoggerLevel.ERROR: return
         exc_info = kwargs.pop('exc_info', None)
         if exc_info:
             kwargs['exc_info'] = sys.exc_info()
-        await self.log('ERROR', message, args, kwargs)
+        self.log_nowait('ERROR', message, args, kwargs)
 
-    async def critical(self, message, *args, **kwargs):
+    def critical_nowait(self, message, *args, **kwargs):
         if self.engine.min_levelno > LoggerLevel.CRITICAL: return
         exc_info = kwargs.pop('exc_info', None)
         if exc_info:
             kwargs['exc_info'] = sys.exc_info()
-        await self.log('CRITICAL', message, args, kwargs)
+        self.log_nowait('CRITICAL', message, args, kwargs)
 
-    async def exception(self, message, *args, **kwargs):
+    def exception_nowait(self, message, *args, **kwargs):
         kwargs.pop('exc_info', None)
-        await self.error(message, *args, exc_info=True, **kwargs)
+        self.error_nowait(message, *args, exc_info=True, **kwargs)
 
 logger = AsyncLogger("root")
\ No newline at end of file
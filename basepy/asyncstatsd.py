@@ -1,23 +1,59 @@
 import asyncio
+import functools
 import random
 import time
 
-from basepy.asynclib import datagram
-
 __all__ = ['StatsdClient']
 
 
+# encoded stat names, bounded so dynamic names do not grow it forever
+@functools.lru_cache(maxsize=1024)
+def _stat_bytes(stat):
+    if isinstance(stat, bytes):
+        return stat
+    return stat.encode('ascii')
+
+
 class StatsdClient(object):
     """A client for statsd."""
 
-    def __init__(self, host='127.0.0.1', port=8125, prefix=None, loop=None):
-        """Create a new client."""
+    def __init__(self, host='127.0.0.1', port=8125, prefix=None, loop=None,
+                 buffered=False, mtu=1400, flush_interval=0.1):
+        """Create a new client.
+
+        With `buffered` set, metrics are collected into newline separated
+        packets of at most `mtu` bytes and sent every `flush_interval`
+        seconds, or as soon as a packet is full.
+        """
         self._prefix = prefix
-        self._loop = loop or asyncio.get_event_loop()
-        self._stream = datagram.DatagramAutoClient(host, port)
+        self._prefix_b = ('%s.' % prefix).encode('ascii') if prefix else b''
+        self._rate_suffixes = {}
+        self._random = random.Random().random
+        self._loop = loop
+        self._addr = (host, port)
+        self._transport = None
+        self._init_lock = asyncio.Lock()
+        self._last_send_exception = None
+        self._buffered = buffered
+        self._mtu = mtu
+        self._flush_interval = flush_interval
+        self._buf = []
+        self._buf_len = 0
+        self._flush_handle = None
 
     async def init(self):
-        await self._stream.init()
+        # concurrent first sends share a single endpoint
+        async with self._init_lock:
+            if self._loop is None:
+                self._loop = asyncio.get_running_loop()
+            if self._transport is None:
+                self._transport, _ = await self._loop.create_datagram_endpoint(
+                    asyncio.DatagramProtocol, remote_addr=self._addr)
+
+    def close(self):
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
 
     def pipeline(self):
         return Pipeline(self)
@@ -27,13 +63,21 @@ class StatsdClient(object):
 
     async def timing(self, stat, delta, rate=1):
         """Send new timing information. `delta` is in milliseconds."""
-        data = self._prepare(stat, '%d|ms' % delta, rate)
+        if rate < 1 and self._random() >= rate:
+            return
+        data = self._prepare(stat, b'%d|ms' % delta, rate)
         if data is not None:
             await self._after(data)
 
     async def incr(self, stat, count=1, rate=1):
         """Increment a stat by `count`."""
-        data = self._prepare(stat, '%s|c' % count, rate)
+        if rate < 1 and self._random() >= rate:
+            return
+        if isinstance(count, int):
+            value = b'%d|c' % count
+        else:
+            value = ('%s|c' % count).encode('ascii')
+        data = self._prepare(stat, value, rate)
         if data is not None:
             await self._after(data)
 
@@ -49,33 +93,84 @@ class StatsdClient(object):
             age:5|g     // age is 5
 
         """
+        if rate < 1 and self._random() >= rate:
+            return
         if delta:
-            value = '%+g|g' % value
+            value = b'%+g|g' % value
         else:
-            value = '%g|g' % value
+            value = b'%g|g' % value
         data = self._prepare(stat, value, rate)
         if data is not None:
             await self._after(data)
 
+    def _rate_suffix(self, rate):
+        try:
+            return self._rate_suffixes[rate]
+        except KeyError:
+            suffix = self._rate_suffixes[rate] = ('|@%s' % rate).encode('ascii')
+            return suffix
+
     def _prepare(self, stat, value, rate=1):
+        # sampling is decided by the callers before the value is formatted
         if rate < 1:
-            if random.random() < rate:
-                value = '%s|@%s' % (value, rate)
-            else:
-                return
-
-        if self._prefix:
-            stat = '%s.%s' % (self._prefix, stat)
-
-        data = '%s:%s' % (stat, value)
-        return data
+            value += self._rate_suffix(rate)
+        return b'%s%s:%s' % (self._prefix_b, _stat_bytes(stat), value)
+
+    def _try_send_now(self, data):
+        """Send data if the transport is ready, return False otherwise."""
+        transport = self._transport
+        if transport is None:
+            return False
+        # UDP sends never wait for the peer, the transport either writes
+        # the datagram right away or buffers it
+        try:
+            transport.sendto(data)
+        except Exception as e:
+            self._last_send_exception = e
+            self.close()
+        return True
 
     async def _send(self, data):
         """Send data to statsd."""
-        await self._stream.send(data.encode('ascii'))
+        if self._try_send_now(data):
+            return
+        try:
+            await self.init()
+        except Exception as e:
+            self._last_send_exception = e
+            return
+        self._try_send_now(data)
 
     async def _after(self, data):
-        await self._send(data)
+        if self._buffered:
+            await self._append(data)
+        else:
+            await self._send(data)
+
+    async def _append(self, data):
+        if self._buf and self._buf_len + len(data) + 1 > self._mtu:
+            await self.flush()
+        self._buf.append(data)
+        self._buf_len += len(data) + 1
+        if self._flush_handle is None:
+            loop = asyncio.get_running_loop()
+            self._flush_handle = loop.call_later(
+                self._flush_interval, self._flush_later)
+
+    def _flush_later(self):
+        self._flush_handle = None
+        asyncio.ensure_future(self.flush())
+
+    async def flush(self):
+        """Send all buffered metrics."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._buf:
+            data = b'\n'.join(self._buf)
+            self._buf = []
+            self._buf_len = 0
+            await self._send(data)
 
 
 class Timer(object):
@@ -101,10 +196,24 @@ class Pipeline(StatsdClient):
     def __init__(self, client):
         self._client = client
         self._prefix = client._prefix
-        self._stats = []
+        self._prefix_b = client._prefix_b
+        self._rate_suffixes = client._rate_suffixes
+        self._random = client._random
+        # unbuffered clients keep the 512 byte packets that are safe to
+        # send across the internet
+        self._mtu = client._mtu if client._buffered else 512
+        self._packets = []
+        self._buf = bytearray()
 
     async def _after(self, data):
-        self._stats.append(data)
+        buf = self._buf
+        if buf:
+            if len(buf) + len(data) + 1 > self._mtu:
+                self._packets.append(bytes(buf))
+                buf.clear()
+            else:
+                buf += b'\n'
+        buf += data
 
     async def __aenter__(self):
         return self
@@ -112,15 +221,17 @@ class Pipeline(StatsdClient):
     async def __aexit__(self, typ, value, tb):
         await self.send()
 
+    def close(self):
+        # the transport belongs to the client
+        pass
+
+    async def flush(self):
+        await self.send()
+
     async def send(self):
-        # Use pop(0) to preserve the order of the stats.
-        data = self._stats.pop(0)
-        while self._stats:
-            stat = self._stats.pop(0)
-            if len(stat) + len(data) + 1 >= 512:
-                await self._client._send(data)
-                data = stat
-            else:
-                data += '\n' + stat
-        if data:
+        if self._buf:
+            self._packets.append(bytes(self._buf))
+            self._buf.clear()
+        packets, self._packets = self._packets, []
+        for data in packets:
             await self._client._send(data)
@@ -2,7 +2,6 @@
 
 from functools import wraps
 from time import time
-from collections.abc import Hashable
 import functools
 
 try:
@@ -96,36 +95,18 @@ class cached_property_ttl(object):
             self.__name__ = func.__name__
             self.__module__ = func.__module__
 
-class memoized(object):
+def memoized(func=None, *, maxsize=None):
     '''Decorator. Caches a function's return value each time it is called.
     If called later with the same arguments, the cached value is returned
-    (not reevaluated).
-    '''
-    def __init__(self, func):
-        self.func = func
-        if asyncio and asyncio.iscoroutinefunction(self.func):
-            raise RuntimeError('memoized not support async function yet.')
-        self.cache = {}
-
-    def __call__(self, *args):
-        if not isinstance(args, Hashable):
-            # uncacheable. a list, for instance.
-            # better to not cache than blow up.
-            return self.func(*args)
-        if args in self.cache:
-            return self.cache[args]
-        else:
-            value = self.func(*args)
-            self.cache[args] = value
-        return value
-
-    def __repr__(self):
-        '''Return the function's docstring.'''
-        return self.func.__doc__
-
-    def __get__(self, obj, objtype):
-        '''Support instance methods.'''
-        return functools.partial(self.__call__, obj)
+    (not reevaluated). Arguments must be hashable.
 
-
-_memoize_cache = {}
+    Backed by ``functools.lru_cache``, so ``cache_info()`` and
+    ``cache_clear()`` are available on the decorated function, and it
+    works for instance methods as well. Use ``@memoized(maxsize=n)`` to
+    keep only the ``n`` most recently used results.
+    '''
+    if func is None:
+        return functools.partial(memoized, maxsize=maxsize)
+    if asyncio and asyncio.iscoroutinefunction(func):
+        raise RuntimeError('memoized not support async function yet.')
+    return functools.lru_cache(maxsize=maxsize)(func)
@@ -3,11 +3,34 @@ import sys
 import traceback
 import platform
 import os
+import functools
+import operator
 from inspect import currentframe, getframeinfo
+import json
 from basepy.mixins import ToDictMixin
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 _start_time = time.time()
 
+# orjson writes compact separators, so records differ from json.dumps;
+# set to True to trade that for speed when orjson is installed
+use_orjson = False
+
+
+def _dumps(obj):
+    """json.dumps, through orjson when use_orjson is set and it is installed."""
+    if use_orjson and orjson is not None:
+        try:
+            return orjson.dumps(obj).decode('utf-8')
+        except TypeError:
+            # e.g. non-str keys or ints beyond 64 bit, json handles those
+            pass
+    return json.dumps(obj)
+
 class LoggerLevel:
     CRITICAL = 50
     ERROR = 40
@@ -57,6 +80,20 @@ class BaseHandler(object):
             finally:
                 del t, v, tb
 
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+def _identity(obj):
+    return obj
+
+@functools.lru_cache(maxsize=256)
+def _converter_for(cls):
+    """Return the function converting instances of cls for LogRecord.to_dict."""
+    if cls in _SCALAR_TYPES:
+        return _identity
+    if hasattr(cls, "to_dict"):
+        return operator.methodcaller("to_dict")
+    return ToDictMixin.dump_obj
+
 class LogRecord(object):
     def __init__(self, name, level,
                  msg, args, exc_info, sinfo=None, **kwargs):
@@ -98,16 +135,12 @@ class LogRecord(object):
         return msg
 
     def to_dict(self):
-        def format_obj(obj):
-            # if isinstance(obj, str):
-            #     return obj
+        data = {}
+        for k, v in self.kwargs.items():
             try:
-                if hasattr(obj, "to_dict"):
-                    return obj.to_dict()
-                return ToDictMixin.dump_obj(obj)
+                data[k] = _converter_for(type(v))(v)
             except:
                 raise Exception('Object can not covert to json dict or not have `to_dict` method.')
-        data = dict([(k, format_obj(v)) for k, v in self.kwargs.items()])
         return dict(
             name = self.name,
             level = self.levelname,
@@ -5,7 +5,7 @@ import traceback
 import os
 import platform
 import json
-from basepy.common.log import LoggerLevel, LogRecord, BaseHandler
+from basepy.common.log import LoggerLevel, LogRecord, BaseHandler, _dumps
 from basepy.network.connection import BlockingConnectionPool
 import inspect
 from inspect import currentframe, getframeinfo
@@ -14,9 +14,8 @@ import socket
 class StdoutHandler(BaseHandler):
     terminator = '\n'
     def __init__(self, stream=None, format=None, level="DEBUG", **kwargs):
-        if stream is None:
-            stream = sys.stdout
-        self.stream = stream
+        # None writes to whatever sys.stdout is at the time of the write
+        self._stream = stream
         self.format_str = "[{created}] [{hostname}.{process}] [{level}] [{name}] [{message}]"
         self.level = level
         self.levelno = LoggerLevel.get_levelno(self.level, 0)
@@ -26,6 +25,16 @@ class StdoutHandler(BaseHandler):
         if self.stream and hasattr(self.stream, "flush"):
             self.stream.flush()
 
+    @property
+    def stream(self):
+        if self._stream is None:
+            return sys.stdout
+        return self._stream
+
+    def reset_buffer(self):
+        """Flush the stream and forget state derived from an earlier one."""
+        self.flush()
+
     def emit(self, record):
         try:
             msg = self.make_message(record)
@@ -93,7 +102,7 @@ class SocketHandler(BaseHandler):
 
     def emit(self, record):
         try:
-            msg = "{}{}".format(json.dumps(record.to_dict()), self.terminator)
+            msg = "{}{}".format(_dumps(record.to_dict()), self.terminator)
             self._write(msg.encode("utf-8"))
         except Exception:
             self.handle_error(record)
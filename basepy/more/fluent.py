@@ -33,8 +33,14 @@ class AsyncFluentSender(object):
                  buffer_overflow_handler=None,
                  nanosecond_precision=False,
                  msgpack_kwargs=None,
+                 flush_interval=None,
+                 flush_size=64 * 1024,
                  **kwargs):
         """
+        :param flush_interval: When set, emitted messages are collected and
+            written together every `flush_interval` seconds, or as soon as
+            `flush_size` bytes are waiting. emit() then returns True once
+            the message is buffered.
         :param kwargs: This kwargs argument is not used in __init__. This will be removed in the next major version.
         """
         self.tag = tag
@@ -46,6 +52,12 @@ class AsyncFluentSender(object):
         self.buffer_overflow_handler = buffer_overflow_handler
         self.nanosecond_precision = nanosecond_precision
         self.msgpack_kwargs = {} if msgpack_kwargs is None else msgpack_kwargs
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+
+        self._buf = bytearray()
+        self._flush_task = None
+        self._flush_lock = asyncio.Lock()
 
         self._reader = None
         self._writer = None
@@ -85,6 +97,12 @@ class AsyncFluentSender(object):
         if self._closed:
             return
         self._closed = True
+        if self._flush_task is not None:
+            # still waiting for flush_interval, flush() below sends its data
+            self._flush_task.cancel()
+            self._flush_task = None
+        # waits for a flush already writing, then sends what is left
+        await self.flush()
         if self.pendings:
             try:
                 self._send_data(self.pendings)
@@ -108,7 +126,28 @@ class AsyncFluentSender(object):
     async def _send(self, bytes_):
         if self._closed:
             return False
-        return await self._send_internal(bytes_)
+        if self.flush_interval is None:
+            return await self._send_internal(bytes_)
+        self._buf += bytes_
+        if len(self._buf) >= self.flush_size:
+            return await self.flush()
+        if self._flush_task is None:
+            self._flush_task = asyncio.ensure_future(self._flush_later())
+        return True
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.flush_interval)
+        self._flush_task = None
+        await self.flush()
+
+    async def flush(self):
+        """Write all buffered messages in one go."""
+        async with self._flush_lock:
+            if not self._buf:
+                return True
+            bytes_ = bytes(self._buf)
+            self._buf.clear()
+            return await self._send_internal(bytes_)
 
     async def _send_internal(self, bytes_):
         # buffering
@@ -185,16 +224,26 @@ class AsyncFluentSender(object):
 
 class FluentHandler(BaseHandler):
     terminator = '\n'
-    def __init__(self, tag, host="127.0.0.1", port=24224, level="DEBUG", **kwargs):
+    def __init__(self, tag, host="127.0.0.1", port=24224, level="DEBUG",
+                 flush_interval=None, **kwargs):
         self.tag = tag
         self.host = host
         self.port = port
-        self.fluentsender = AsyncFluentSender(tag, host=host, port=port)
+        self.fluentsender = AsyncFluentSender(tag, host=host, port=port,
+                                              flush_interval=flush_interval)
         self.level = level
         self.levelno = LoggerLevel.get_levelno(self.level, 0)
 
     def flush(self):
-        pass
+        """Schedule a flush of the sender's buffer, return it as a future.
+
+        Returns None when no event loop is running.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+        return asyncio.ensure_future(self.fluentsender.flush())
 
     async def emit(self, record):
         try:
@@ -1,8 +1,7 @@
 
 import time
 import sys
-import json
-from basepy.common.log import LoggerLevel, LogRecord, BaseHandler
+from basepy.common.log import LoggerLevel, LogRecord, BaseHandler, _dumps
 from basepy.asynclog import AsyncLoggerEngine, logger
 
 from rich.console import Console
@@ -14,6 +13,7 @@ from rich.traceback import install
 
 class RichConsoleHandler(BaseHandler):
     terminator = '\n'
+    is_async = False
     color_map = {
         'DEBUG': 'yellow',
         'INFO': 'cyan',
@@ -57,7 +57,7 @@ class RichConsoleHandler(BaseHandler):
                 if data['data']:
                     pprint(data['data'], console=self.console, max_depth=5)
             else:
-                msg = json.dumps(data)
+                msg = _dumps(data)
                 stream.write('{}{}'.format(msg, self.terminator))
 
             self.flush()
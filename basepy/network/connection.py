@@ -1,10 +1,10 @@
 import errno
 import os
 import random
+import selectors
 import socket
 import ssl
 import sys
-from itertools import chain
 from queue import Empty, Full, LifoQueue
 
 from basepy.exceptions import ConnectionError
@@ -18,12 +18,13 @@ def threading_spawn(func, *args, **kwargs):
     t.start()
     return t
 
+_shutdown_event = threading.Event()
+
 def threading_wait():
-    while 1:
-        try:
-            time.sleep(3)
-        except (KeyboardInterrupt, SystemExit):
-            sys.exit()
+    try:
+        _shutdown_event.wait()
+    except (KeyboardInterrupt, SystemExit):
+        sys.exit()
 spawn_func = threading_spawn
 sleep_func = time.sleep
 lock_class = threading.Lock
@@ -36,12 +37,17 @@ class Connection(object):
 
     def __init__(self, host, port,
                  socket_connect_timeout=None,
-                 socket_timeout=None, **kwargs):
+                 socket_timeout=None,
+                 socket_buffer_size=None,
+                 nodelay=True, cork=False, **kwargs):
         self.pid = os.getpid()
         self.host = host
         self.port = int(port)
         self.socket_timeout = socket_timeout
         self.socket_connect_timeout = socket_connect_timeout or socket_timeout
+        self.socket_buffer_size = socket_buffer_size
+        self.nodelay = nodelay
+        self.cork = cork
         self._sock = None
         self._description_args = {
             'host': self.host,
@@ -50,6 +56,10 @@ class Connection(object):
         }
         self._connect_callbacks = []
         self.buffer = b""
+        # reusable receive buffer, allocated once so reads do not need a
+        # fresh bytes object for every recv
+        self._recv_scratch = bytearray(65536)
+        self._recv_view = memoryview(self._recv_scratch)
         self.ssl_conn = False
         if 'ssl_keyfile' in kwargs or 'ssl_certfile' in kwargs:
             self.ssl_conn = True
@@ -119,28 +129,30 @@ class Connection(object):
         if len(resources) == 0:
             raise Exception("getaddrinfo returns an empty list")
 
-        index = random.randint(1, len(resources))
-        start = index % len(resources)
+        if len(resources) == 1:
+            addrs = resources
+        else:
+            addrs = random.sample(resources, len(resources))
 
-        for i in range(len(resources)):
-            family, socktype, proto, canonname, socket_address \
-                = resources[(start+i) % len(resources)]
+        last = len(addrs) - 1
+        for i, (family, socktype, proto, canonname, socket_address) \
+                in enumerate(addrs):
             sock = None
 
             try:
                 sock = socket.socket(family, socktype, proto)
-                # TCP_NODELAY
-                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                self._set_sockopts(sock)
 
-                # set the socket_connect_timeout before we connect
-                sock.settimeout(self.socket_connect_timeout)
-
-                # connect
-                sock.connect(socket_address)
+                # connect, waiting at most socket_connect_timeout
+                self._connect_socket(sock, socket_address)
 
                 # set the socket_timeout now that we're connected
                 sock.settimeout(self.socket_timeout)
 
+                # TCP_QUICKACK is not sticky, it is set after connect and
+                # again after every recv
+                self._set_quickack(sock)
+
                 if self.ssl_conn:
                     sock = ssl.wrap_socket(sock,
                                            cert_reqs=self.cert_reqs,
@@ -152,11 +164,50 @@ class Connection(object):
             except socket.error:
                 if sock is not None:
                     sock.close()
-                if i == len(resources)-1:
+                if i == last:
                     raise
 
         raise socket.error("socket.getaddrinfo returned an empty list")
 
+    def _connect_socket(self, sock, socket_address):
+        # non-blocking connect, then wait for the socket to become
+        # writable in a selector honouring socket_connect_timeout
+        sock.setblocking(False)
+        err = sock.connect_ex(socket_address)
+        if err in (errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN):
+            with selectors.DefaultSelector() as sel:
+                sel.register(sock, selectors.EVENT_WRITE)
+                if not sel.select(self.socket_connect_timeout):
+                    raise socket.timeout("timed out")
+            err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+        if err:
+            raise socket.error(err, os.strerror(err))
+        sock.setblocking(True)
+
+    def _set_sockopts(self, sock):
+        if self.nodelay:
+            # TCP_NODELAY
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if self.cork and hasattr(socket, 'TCP_CORK'):
+            # let the kernel pack full segments for throughput oriented use
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_CORK, 1)
+        if self.socket_buffer_size:
+            # a fixed size turns off the kernel autotuning for this socket,
+            # so it is only set when asked for
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF,
+                            self.socket_buffer_size)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF,
+                            self.socket_buffer_size)
+
+    def _set_quickack(self, sock):
+        # Linux only, avoids delayed ACK stalls for request/response traffic
+        if not self.nodelay or not hasattr(socket, 'TCP_QUICKACK'):
+            return
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+        except OSError:
+            pass
+
     def _error_message(self, exception):
         # args for socket.error can either be (errno, "message")
         # or just "message"
@@ -175,13 +226,21 @@ class Connection(object):
         if self._sock is None:
             return
         try:
-            self._sock.shutdown(socket.SHUT_RDWR)
             self._sock.close()
         except socket.error:
             pass
         self._sock = None
         self.on_disconnect()
 
+    def shutdown_write(self):
+        """Half-close the connection, signalling EOF to the server"""
+        if self._sock is None:
+            return
+        try:
+            self._sock.shutdown(socket.SHUT_WR)
+        except socket.error:
+            pass
+
     def on_disconnect(self):
         pass
 
@@ -194,22 +253,55 @@ class Connection(object):
         sock = self.connection()
         return sock.recv(n)
 
+    def _read_into(self):
+        sock = self.connection()
+        n = sock.recv_into(self._recv_view)
+        self._set_quickack(sock)
+        return n
+
     def read(self, byte_length):
         while len(self.buffer) < byte_length:
             try:
-                data = self._read(1024)
+                n = self._read_into()
             except socket.error as ex:
                 if ex.args[0] == errno.EINTR:
                     continue
                 raise ex
-            if not data:
+            if not n:
                 break
 
-            self.buffer += data
+            self.buffer += self._recv_view[:n]
         result = self.buffer[:byte_length]
         self.buffer = self.buffer[byte_length:]
         return result
 
+    def read_exact(self, byte_length):
+        """
+        Read exactly ``byte_length`` bytes for fixed size frames.
+        Data is received straight into the result buffer, so large bodies
+        are not copied through ``self.buffer``. Returns fewer bytes only
+        if the server closed the connection.
+        """
+        result = bytearray(byte_length)
+        view = memoryview(result)
+        pos = min(len(self.buffer), byte_length)
+        view[:pos] = self.buffer[:pos]
+        self.buffer = self.buffer[pos:]
+
+        sock = self.connection()
+        while pos < byte_length:
+            try:
+                n = sock.recv_into(view[pos:])
+            except socket.error as ex:
+                if ex.args[0] == errno.EINTR:
+                    continue
+                raise ex
+            if not n:
+                break
+            self._set_quickack(sock)
+            pos += n
+        return bytes(view[:pos])
+
     def write(self, string):
         bstring = b""
         if isinstance(string, str):
@@ -291,9 +383,9 @@ class ConnectionPool(object):
 
     def disconnect(self):
         """Disconnects all connections in the pool"""
-        all_conns = chain(self._available_connections,
-                          self._in_use_connections)
-        for connection in all_conns:
+        for connection in self._available_connections:
+            connection.disconnect()
+        for connection in self._in_use_connections:
             connection.disconnect()
 
 
@@ -327,6 +419,8 @@ class BlockingConnectionPool(ConnectionPool):
         self.queue_class = queue_class
         self.timeout = timeout
         self.pool = None
+        self._permits = None
+        self._permits_lock = None
         self._connections = None
         super(BlockingConnectionPool, self).__init__(
             connection_class=connection_class,
@@ -337,13 +431,11 @@ class BlockingConnectionPool(ConnectionPool):
         self.pid = os.getpid()
         self._check_lock = lock_class()
 
-        # Create and fill up a thread safe queue with ``None`` values.
+        # Start with an empty queue and a number of connections we are
+        # still allowed to create, connections are made lazily on demand.
         self.pool = self.queue_class(self.max_connections)
-        while True:
-            try:
-                self.pool.put_nowait(None)
-            except Full:
-                break
+        self._permits = self.max_connections
+        self._permits_lock = lock_class()
 
         # Keep a list of actual connection instances so that we can
         # disconnect them later.
@@ -359,16 +451,27 @@ class BlockingConnectionPool(ConnectionPool):
         """
         Get a connection, blocking for ``self.timeout`` until a connection
         is available from the pool.
-        If the connection returned is ``None`` then creates a new connection.
-        Because we use a last-in first-out queue, the existing connections
-        (having been returned to the pool after the initial ``None`` values
-        were added) will be returned before ``None`` values. This means we only
-        create new connections when we need to, i.e.: the actual number of
-        connections will only increase in response to demand.
+        Idle connections are reused first. If there is none and the pool
+        has not created ``max_connections`` yet, a new connection is made,
+        otherwise we wait for another client to release one. This means we
+        only create new connections when we need to, i.e.: the actual number
+        of connections will only increase in response to demand.
         """
         # Make sure we haven't changed process.
         self._checkpid()
 
+        try:
+            return self.pool.get_nowait()
+        except Empty:
+            pass
+
+        with self._permits_lock:
+            can_create = self._permits > 0
+            if can_create:
+                self._permits -= 1
+        if can_create:
+            return self.make_connection()
+
         # Try and get a connection from the pool. If one isn't available within
         # self.timeout then raise a ``ConnectionError``.
         try:
@@ -376,11 +479,6 @@ class BlockingConnectionPool(ConnectionPool):
         except Empty:
             raise ConnectionError("No connection available.")
 
-        # If the ``connection`` is actually ``None`` then that's a cue to make
-        # a new connection to add to the pool.
-        if connection is None:
-            connection = self.make_connection()
-
         return connection
 
     def release(self, connection):
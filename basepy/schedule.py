@@ -37,18 +37,28 @@ Usage:
 [2] https://github.com/Rykian/clockwork
 [3] https://adam.herokuapp.com/past/2010/6/30/replace_cron_with_clockwork/
 """
+from collections import defaultdict
 from collections.abc import Hashable
 import datetime
 from datetime import timedelta
 import functools
+import heapq
+import itertools
 import logging
 import random
 import re
 import time
-from typing import Set, List, Optional, Callable, Union
+from typing import Set, Dict, List, Optional, Callable, Union
 
 logger = logging.getLogger("schedule")
 
+_AT_RE = re.compile(r"^(?:(\d+)h)?(?:(\d+)m)?(?:(\d+)s)?$")
+# "%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d", "%H:%M:%S" or "%H:%M"
+_UNTIL_RE = re.compile(
+    r"^(?:(?P<year>\d{4})-(?P<month>\d{1,2})-(?P<day>\d{1,2}))?"
+    r"(?:(?(year)\s+)(?P<hour>\d{1,2}):(?P<minute>\d{1,2})(?::(?P<second>\d{1,2}))?)?$"
+)
+
 
 class ScheduleError(Exception):
     """Base schedule exception"""
@@ -79,6 +89,12 @@ class Scheduler(object):
 
     def __init__(self) -> None:
         self.jobs: List[Job] = []
+        # heap of (next_run_mono, counter, job), entries whose counter no longer
+        # matches job._heap_count are stale and skipped when popped
+        self._heap: List[tuple] = []
+        self._counter = itertools.count()
+        # tag -> jobs with that tag, dict used as an insertion ordered set
+        self._by_tag: Dict[Hashable, Dict[Job, None]] = defaultdict(dict)
 
     def run_pending(self) -> None:
         """
@@ -90,9 +106,21 @@ class Scheduler(object):
         in one hour increments then your job won't be run 60 times in
         between but only once.
         """
-        runnable_jobs = (job for job in self.jobs if job.should_run)
-        for job in sorted(runnable_jobs):
-            self._run_job(job)
+        now = time.monotonic()
+        runnable_jobs = []
+        while self._heap and self._heap[0][0] <= now:
+            _, count, job = heapq.heappop(self._heap)
+            if count == job._heap_count:
+                runnable_jobs.append(job)
+        for i, job in enumerate(runnable_jobs):
+            try:
+                self._run_job(job, now)
+            except BaseException:
+                # the raising job and the ones not run yet keep their place
+                for pending in runnable_jobs[i:]:
+                    if pending._heap_count is not None:
+                        self._push(pending)
+                raise
 
     def run_all(self, delay_seconds: int = 0) -> None:
         """
@@ -124,7 +152,7 @@ class Scheduler(object):
         if tag is None:
             return self.jobs[:]
         else:
-            return [job for job in self.jobs if tag in job.tags]
+            return list(self._by_tag.get(tag, ()))
 
     def clear(self, tag: Optional[Hashable] = None) -> None:
         """
@@ -136,10 +164,20 @@ class Scheduler(object):
         """
         if tag is None:
             logger.debug("Deleting *all* jobs")
+            for job in self.jobs:
+                job._heap_count = None
             del self.jobs[:]
+            del self._heap[:]
+            self._by_tag.clear()
         else:
             logger.debug('Deleting all jobs tagged "%s"', tag)
-            self.jobs[:] = (job for job in self.jobs if tag not in job.tags)
+            tagged = self._by_tag.pop(tag, None)
+            if not tagged:
+                return
+            for job in tagged:
+                job._heap_count = None
+                self._untag(job)
+            self.jobs[:] = (job for job in self.jobs if job not in tagged)
 
     def cancel_job(self, job: "Job") -> None:
         """
@@ -150,9 +188,24 @@ class Scheduler(object):
         try:
             logger.debug('Cancelling job "%s"', str(job))
             self.jobs.remove(job)
+            job._heap_count = None
+            self._untag(job)
         except ValueError:
             logger.debug('Cancelling not-scheduled job "%s"', str(job))
 
+    def _tag(self, job: "Job", tags) -> None:
+        for tag in tags:
+            self._by_tag[tag][job] = None
+
+    def _untag(self, job: "Job") -> None:
+        for tag in job.tags:
+            tagged = self._by_tag.get(tag)
+            if tagged is None:
+                continue
+            tagged.pop(job, None)
+            if not tagged:
+                del self._by_tag[tag]
+
     def every_s(self, interval: int) -> "Job":
         job = Job(timedelta(seconds=interval), self)
         return job
@@ -193,10 +246,32 @@ class Scheduler(object):
         job = Job(td, self)
         return job
 
-    def _run_job(self, job: "Job") -> None:
-        ret = job.run()
+    def _run_job(self, job: "Job", now: Optional[float] = None) -> None:
+        ret = job.run(now)
         if isinstance(ret, CancelJob) or ret is CancelJob:
             self.cancel_job(job)
+        elif job._heap_count is not None:
+            # cancel_job() and clear() reset _heap_count, a job cancelled
+            # while it ran is not scheduled again
+            self._push(job)
+
+    def _add_job(self, job: "Job") -> None:
+        self.jobs.append(job)
+        self._tag(job, job.tags)
+        self._push(job)
+
+    def _push(self, job: "Job") -> None:
+        count = next(self._counter)
+        job._heap_count = count
+        heapq.heappush(self._heap, (job.next_run_mono, count, job))
+
+    def _peek(self) -> Optional["Job"]:
+        while self._heap:
+            _, count, job = self._heap[0]
+            if count == job._heap_count:
+                return job
+            heapq.heappop(self._heap)
+        return None
 
     @property
     def next_run(self) -> Optional[datetime.datetime]:
@@ -206,9 +281,10 @@ class Scheduler(object):
         :return: A :class:`~datetime.datetime` object
                  or None if no jobs scheduled
         """
-        if not self.jobs:
+        job = self._peek()
+        if job is None:
             return None
-        return min(self.jobs).next_run
+        return job.next_run
 
     @property
     def idle_seconds(self) -> Optional[float]:
@@ -217,9 +293,10 @@ class Scheduler(object):
                  :meth:`next_run <Scheduler.next_run>`
                  or None if no jobs are scheduled
         """
-        if not self.next_run:
+        job = self._peek()
+        if job is None:
             return None
-        return (self.next_run - datetime.datetime.now()).total_seconds()
+        return job.next_run_mono - time.monotonic()
 
 
 class Job(object):
@@ -242,50 +319,82 @@ class Job(object):
 
     def __init__(self, interval: timedelta,  scheduler: Scheduler = None):
         self.period: Optional[timedelta] = interval  # pause interval * unit between runs
-        self.job_func: Optional[functools.partial] = None  # the job job_func to run
+        self.job_func: Optional[Callable] = None  # the job job_func to run
+        self._func_name: Optional[str] = None  # name of job_func for __str__/__repr__
+        self._func_args: tuple = ()  # arguments bound to job_func
+        self._func_kwargs: dict = {}
 
         self.at_day: Optional[timedelta] = None
         # optional time at which this job runs
         self.at_time: Optional[timedelta] = None
+        # at_day + at_time, updated whenever one of them changes
+        self._at_offset: timedelta = timedelta(0)
+        # period + at_offset in seconds, the delay between a run and the next one
+        self._next_run_delta_s: float = interval.total_seconds()
 
+        # time.monotonic() of the last run
+        self.last_run_mono: Optional[float] = None
 
-        # datetime of the last run
-        self.last_run: Optional[datetime.datetime] = None
-
-        # datetime of the next run
-        self.next_run: Optional[datetime.datetime] = None
+        # time.monotonic() of the next run
+        self.next_run_mono: Optional[float] = None
 
         # optional time of final run
         self.cancel_after: Optional[datetime.datetime] = None
+        # cancel_after on the time.monotonic() clock
+        self._cancel_after_mono: Optional[float] = None
 
         self.tags: Set[Hashable] = set()  # unique set of tags for the job
         self.scheduler: Optional[Scheduler] = scheduler  # scheduler to register with
 
+        # counter of the live entry in the scheduler heap
+        self._heap_count: Optional[int] = None
+
     @property
     def at_offset(self):
+        return self._at_offset
+
+    def _update_at_offset(self):
         at_day = self.at_day or timedelta(days=0)
         at_time = self.at_time or timedelta(seconds=0)
-        return at_day + at_time
+        self._at_offset = at_day + at_time
+        self._next_run_delta_s = (self.period + self._at_offset).total_seconds()
+
+    @staticmethod
+    def _mono_to_datetime(mono: Optional[float]) -> Optional[datetime.datetime]:
+        if mono is None:
+            return None
+        return datetime.datetime.now() + timedelta(seconds=mono - time.monotonic())
+
+    @property
+    def last_run(self) -> Optional[datetime.datetime]:
+        """
+        Datetime of the last run, derived from :attr:`last_run_mono`.
+        """
+        return self._mono_to_datetime(self.last_run_mono)
+
+    @property
+    def next_run(self) -> Optional[datetime.datetime]:
+        """
+        Datetime of the next run, derived from :attr:`next_run_mono`.
+        """
+        return self._mono_to_datetime(self.next_run_mono)
 
     def __lt__(self, other) -> bool:
         """
         PeriodicJobs are sortable based on the scheduled time they
         run next.
         """
-        return self.next_run < other.next_run
+        return self.next_run_mono < other.next_run_mono
 
     def __str__(self) -> str:
-        if hasattr(self.job_func, "__name__"):
-            job_func_name = self.job_func.__name__  # type: ignore
-        else:
-            job_func_name = repr(self.job_func)
+        job_func_name = self._func_name or repr(self.job_func)
 
         return ("Job(period={}, at={}, do={}, args={}, kwargs={})").format(
             self.period,
             self.at_offset,
             job_func_name,
-            "()" if self.job_func is None else self.job_func.args,
-            "{}" if self.job_func is None else self.job_func.keywords,
+            self._func_args,
+            self._func_kwargs,
         )
 
     def __repr__(self):
@@ -300,12 +409,9 @@ class Job(object):
             format_time(self.next_run),
         )
 
-        if hasattr(self.job_func, "__name__"):
-            job_func_name = self.job_func.__name__
-        else:
-            job_func_name = repr(self.job_func)
-        args = [repr(x) if is_repr(x) else str(x) for x in self.job_func.args]
-        kwargs = ["%s=%s" % (k, repr(v)) for k, v in self.job_func.keywords.items()]
+        job_func_name = self._func_name or repr(self.job_func)
+        args = [repr(x) if is_repr(x) else str(x) for x in self._func_args]
+        kwargs = ["%s=%s" % (k, repr(v)) for k, v in self._func_kwargs.items()]
         call_repr = job_func_name + "(" + ", ".join(args + kwargs) + ")"
 
         if self.at_time is not None:
@@ -330,6 +436,7 @@ class Job(object):
 
     def day(self, number:int):
         self.at_day = timedelta(days=number)
+        self._update_at_offset()
         self.validate_offset()
         return self
 
@@ -350,6 +457,9 @@ class Job(object):
         if not all(isinstance(tag, Hashable) for tag in tags):
             raise TypeError("Tags must be hashable")
         self.tags.update(tags)
+        if self._heap_count is not None:
+            # already scheduled, keep the scheduler tag index in sync
+            self.scheduler._tag(self, tags)
         return self
 
     def at(self, time_str):
@@ -365,21 +475,23 @@ class Job(object):
         """
         if not isinstance(time_str, str):
             raise TypeError("at() should be passed a string")
-        matched = re.match(r"^(\d+h)?(\d+m)?(\d+s)?$", time_str)
+        matched = _AT_RE.match(time_str)
         if not matched:
             raise ScheduleValueError(f"time str {time_str} wrong.")
 
-        time_values = map(lambda x: int(x[0:-1]) if x else 0, matched.groups())
-        hour: Union[str, int]
-        minute: Union[str, int]
-        second: Union[str, int]
-        hour, minute, second = time_values
-        self.at_time = datetime.timedelta(hours=hour, minutes=minute, seconds=second)
+        hour, minute, second = matched.groups()
+        self.at_time = datetime.timedelta(
+            hours=int(hour) if hour else 0,
+            minutes=int(minute) if minute else 0,
+            seconds=int(second) if second else 0,
+        )
+        self._update_at_offset()
         self.validate_offset()
         return self
 
     def at_delta(self, delta:timedelta):
         self.at_time = delta
+        self._update_at_offset()
         self.validate_offset()
         return self
 
@@ -421,34 +533,21 @@ class Job(object):
                 datetime.datetime.now(), until_time
             )
         elif isinstance(until_time, str):
-            cancel_after = self._decode_datetimestr(
-                until_time,
-                [
-                    "%Y-%m-%d %H:%M:%S",
-                    "%Y-%m-%d %H:%M",
-                    "%Y-%m-%d",
-                    "%H:%M:%S",
-                    "%H:%M",
-                ],
-            )
+            cancel_after = self._decode_datetimestr(until_time)
             if cancel_after is None:
                 raise ScheduleValueError("Invalid string format for until()")
-            if "-" not in until_time:
-                # the until_time is a time-only format. Set the date to today
-                now = datetime.datetime.now()
-                cancel_after = cancel_after.replace(
-                    year=now.year, month=now.month, day=now.day
-                )
             self.cancel_after = cancel_after
         else:
             raise TypeError(
                 "until() takes a string, datetime.datetime, timedelta, "
                 "datetime.time parameter"
             )
-        if self.cancel_after < datetime.datetime.now():
+        remaining = (self.cancel_after - datetime.datetime.now()).total_seconds()
+        if remaining < 0:
             raise ScheduleValueError(
                 "Cannot schedule a job to run until a time in the past"
             )
+        self._cancel_after_mono = time.monotonic() + remaining
         return self
 
     def do(self, job_func: Callable, *args, **kwargs):
@@ -462,15 +561,21 @@ class Job(object):
         :param job_func: The function to be scheduled
         :return: The invoked job instance
         """
-        self.job_func = functools.partial(job_func, *args, **kwargs)
-        functools.update_wrapper(self.job_func, job_func)
+        if args or kwargs:
+            self.job_func = functools.partial(job_func, *args, **kwargs)
+        else:
+            # nothing to bind, call job_func directly on every run
+            self.job_func = job_func
+        self._func_args = args
+        self._func_kwargs = kwargs
+        self._func_name = getattr(job_func, "__name__", None) or repr(job_func)
         self._schedule_next_run()
         if self.scheduler is None:
             raise ScheduleError(
                 "Unable to a add job to schedule. "
                 "Job is not associated with an scheduler"
             )
-        self.scheduler.jobs.append(self)
+        self.scheduler._add_job(self)
         return self
 
     @property
@@ -478,10 +583,10 @@ class Job(object):
         """
         :return: ``True`` if the job should be run now.
         """
-        assert self.next_run is not None, "must run _schedule_next_run before"
-        return datetime.datetime.now() >= self.next_run
+        assert self.next_run_mono is not None, "must run _schedule_next_run before"
+        return time.monotonic() >= self.next_run_mono
 
-    def run(self):
+    def run(self, now: Optional[float] = None):
         """
         Run the job and immediately reschedule it.
         If the job's deadline is reached (configured using .until()), the job is not
@@ -489,42 +594,64 @@ class Job(object):
         the job's deadline, CancelJob is returned after the execution. In this latter
         case CancelJob takes priority over any other returned value.
 
+        :param now: The current ``time.monotonic()`` value, shared by all
+                    jobs run in the same :meth:`Scheduler.run_pending` tick.
+                    It is only used for the deadline check, the next run is
+                    scheduled from the time the job finished.
         :return: The return value returned by the `job_func`, or CancelJob if the job's
                  deadline is reached.
 
         """
-        if self._is_overdue(datetime.datetime.now()):
+        if now is None:
+            now = time.monotonic()
+        if self._is_overdue(now):
             logger.debug("Cancelling job %s", self)
             return CancelJob
 
         logger.debug("Running job %s", self)
         ret = self.job_func()
-        self.last_run = datetime.datetime.now()
-        self._schedule_next_run()
+        self.last_run_mono = time.monotonic()
+        self._schedule_next_run(self.last_run_mono)
 
-        if self._is_overdue(self.next_run):
+        if self._is_overdue(self.next_run_mono):
             logger.debug("Cancelling job %s", self)
             return CancelJob
         return ret
 
-    def _schedule_next_run(self) -> None:
+    def _schedule_next_run(self, now: Optional[float] = None) -> None:
         """
         Compute the instant when this job should run next.
         """
-        self.next_run = datetime.datetime.now() + self.period + self.at_offset
+        if now is None:
+            now = time.monotonic()
+        self.next_run_mono = now + self._next_run_delta_s
 
-    def _is_overdue(self, when: datetime.datetime):
-        return self.cancel_after is not None and when > self.cancel_after
+    def _is_overdue(self, when: float):
+        return self._cancel_after_mono is not None and when > self._cancel_after_mono
 
-    def _decode_datetimestr(
-        self, datetime_str: str, formats: List[str]
-    ) -> Optional[datetime.datetime]:
-        for f in formats:
-            try:
-                return datetime.datetime.strptime(datetime_str, f)
-            except ValueError:
-                pass
-        return None
+    def _decode_datetimestr(self, datetime_str: str) -> Optional[datetime.datetime]:
+        """
+        Parse one of the string formats accepted by :meth:`until`. A time
+        without a date is for today, a date without a time is at midnight.
+        """
+        matched = _UNTIL_RE.match(datetime_str)
+        if not matched:
+            return None
+        year, month, day, hour, minute, second = matched.groups()
+        if year is None and hour is None:
+            return None
+        if year is None:
+            today = datetime.datetime.now()
+            year, month, day = today.year, today.month, today.day
+        try:
+            return datetime.datetime(
+                int(year), int(month), int(day),
+                int(hour) if hour else 0,
+                int(minute) if minute else 0,
+                int(second) if second else 0,
+            )
+        except ValueError:
+            return None
 
 
 #: Default :class:`Scheduler <Scheduler>` object
@@ -1,28 +1,73 @@
 import random
 import socket
 import time
-from functools import wraps
+from functools import lru_cache, wraps
 
 
 __all__ = ['StatsdClient']
 
+
+# encoded stat names, bounded so dynamic names do not grow it forever
+@lru_cache(maxsize=1024)
+def _stat_bytes(stat):
+    if isinstance(stat, bytes):
+        return stat
+    return stat.encode('ascii')
+
+
 class StatsdClient(object):
     """A client for statsd."""
 
-    def __init__(self, host='127.0.0.1', port=8125, prefix=None):
-        """Create a new client."""
+    def __init__(self, host='127.0.0.1', port=8125, prefix=None,
+                 buffered=False, mtu=1400):
+        """Create a new client.
+
+        With `buffered` set, metrics are collected into newline separated
+        packets of at most `mtu` bytes, call `flush()` to send the rest.
+        """
         self._addr = (host, port)
         self._sock = None
         self._prefix = prefix
+        self._prefix_b = ('%s.' % prefix).encode('ascii') if prefix else b''
+        self._rate_suffixes = {}
+        self._random = random.Random().random
+        self._buffered = buffered
+        self._mtu = mtu
+        self._buf = bytearray()
 
     @property
     def sock(self):
         if not self._sock:
-            self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            # a connected datagram socket lets send() skip the per packet
+            # address lookup
+            try:
+                sock.connect(self._addr)
+            except socket.error:
+                sock.close()
+                raise
+            self._sock = sock
         return self._sock
 
     def _after(self, data):
-        self._send(data)
+        if self._buffered:
+            self._append(data)
+        else:
+            self._send(data)
+
+    def _append(self, data):
+        if self._buf and len(self._buf) + len(data) + 1 > self._mtu:
+            self.flush()
+        if self._buf:
+            self._buf += b'\n'
+        self._buf += data
+
+    def flush(self):
+        """Send all buffered metrics."""
+        if self._buf:
+            data = self._buf
+            self._buf = bytearray()
+            self._send(data)
 
     def pipeline(self):
         return Pipeline(self)
@@ -32,13 +77,21 @@ class StatsdClient(object):
 
     def timing(self, stat, delta, rate=1):
         """Send new timing information. `delta` is in milliseconds."""
-        data = self._prepare(stat, '%d|ms' % delta, rate)
+        if rate < 1 and self._random() >= rate:
+            return
+        data = self._prepare(stat, b'%d|ms' % delta, rate)
         if data is not None:
             self._after(data)
 
     def incr(self, stat, count=1, rate=1):
         """Increment a stat by `count`."""
-        data = self._prepare(stat, '%s|c' % count, rate)
+        if rate < 1 and self._random() >= rate:
+            return
+        if isinstance(count, int):
+            value = b'%d|c' % count
+        else:
+            value = ('%s|c' % count).encode('ascii')
+        data = self._prepare(stat, value, rate)
         if data is not None:
             self._after(data)
 
@@ -54,32 +107,89 @@ class StatsdClient(object):
             age:5|g     // age is 5
 
         """
+        if rate < 1 and self._random() >= rate:
+            return
         if delta:
-            value = '%+g|g' % value
+            value = b'%+g|g' % value
         else:
-            value = '%g|g' % value
+            value = b'%g|g' % value
         data = self._prepare(stat, value, rate)
         if data is not None:
             self._after(data)
 
+    def _rate_suffix(self, rate):
+        try:
+            return self._rate_suffixes[rate]
+        except KeyError:
+            suffix = self._rate_suffixes[rate] = ('|@%s' % rate).encode('ascii')
+            return suffix
+
     def _prepare(self, stat, value, rate=1):
+        # sampling is decided by the callers before the value is formatted
+        data = bytearray(self._prefix_b)
+        data += _stat_bytes(stat)
+        data += b':'
+        data += value
         if rate < 1:
-            if random.random() < rate:
-                value = '%s|@%s' % (value, rate)
-            else:
-                return
-
-        if self._prefix:
-            stat = '%s.%s' % (self._prefix, stat)
-
-        data = '%s:%s' % (stat, value)
+            data += self._rate_suffix(rate)
         return data
 
     def _send(self, data):
         """Send data to statsd."""
         try:
-            self.sock.sendto(data.encode('ascii'), self._addr)
+            self.sock.send(data)
         except socket.error:
             # No time for love, Dr. Jones!
             pass
 
+
+class Timer(object):
+    """A context manager/decorator for statsd.timing()."""
+
+    def __init__(self, client, stat, rate=1):
+        self.client = client
+        self.stat = stat
+        self.rate = rate
+        self.ms = None
+
+    def __call__(self, f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            with self:
+                return f(*args, **kwargs)
+        return wrapper
+
+    def __enter__(self):
+        self.start = time.time()
+        return self
+
+    def __exit__(self, typ, value, tb):
+        dt = time.time() - self.start
+        self.ms = int(round(1000 * dt))  # Convert to ms.
+        self.client.timing(self.stat, self.ms, self.rate)
+
+
+class Pipeline(StatsdClient):
+    """Buffers metrics and sends them in as few packets as possible."""
+
+    def __init__(self, client):
+        self._client = client
+        self._prefix = client._prefix
+        self._prefix_b = client._prefix_b
+        self._rate_suffixes = client._rate_suffixes
+        self._random = client._random
+        self._buffered = True
+        self._mtu = client._mtu
+        self._buf = bytearray()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, typ, value, tb):
+        self.send()
+
+    def _send(self, data):
+        self._client._send(data)
+
+    def send(self):
+        self.flush()
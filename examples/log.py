@@ -1,15 +1,16 @@
-
 import asyncio
 from basepy.asynclog import logger
 
 logger.add("stdout")
 
 async def main():
-    await logger.info("hello")
-    await logger.info("stuct", a=1, b=2, hello='world')
+    logger.info_nowait("hello")
+    logger.info_nowait("stuct", a=1, b=2, hello='world')
+    await logger.flush()
 
 
 asyncio.run(main())
 
 
 
+
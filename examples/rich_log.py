@@ -6,11 +6,12 @@ from basepy.more.rich_console import install_rich_console
 install_rich_console()
 
 async def main():
-    await logger.debug("this is debug message", scope="debug")
-    await logger.info("this is info message", scope="info")
-    await logger.info("hello")
-    await logger.info("stuct", a=1, b=2, hello='world')
-    await logger.warning("warning", a=1, b=2, hello='world')
+    logger.debug_nowait("this is debug message", scope="debug")
+    logger.info_nowait("this is info message", scope="info")
+    logger.info_nowait("hello")
+    logger.info_nowait("stuct", a=1, b=2, hello='world')
+    logger.warning_nowait("warning", a=1, b=2, hello='world')
+    await logger.flush()
 
 
 asyncio.run(main())
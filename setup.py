@@ -1,18 +1,28 @@
-import re
-import ast
-from setuptools import setup, find_packages
+import os
+from setuptools import setup
 
-_version_re = re.compile(r'__version__\s+=\s+(.*)')
+about = {}
+with open('basepy/_version.py') as f:
+    exec(f.read(), about)
+version = about['__version__']
 
-with open('basepy/__init__.py', 'rb') as f:
-    version = str(ast.literal_eval(_version_re.search(
-        f.read().decode('utf-8')).group(1)))
 
-with open('README.md', 'rb') as f:
-    long_description = f.read().decode('utf-8')
+def long_description():
+    """README.md, or '' when it is missing (e.g. a trimmed source tree)."""
+    if not os.path.exists('README.md'):
+        return ''
+    with open('README.md', 'rb') as f:
+        return f.read().decode('utf-8')
 
-packages = ['basepy']
-packages.extend(map(lambda x: 'basepy.{}'.format(x), find_packages('basepy')))
+packages = [
+    'basepy',
+    'basepy.asynclib',
+    'basepy.asynclog',
+    'basepy.common',
+    'basepy.log',
+    'basepy.more',
+    'basepy.network',
+]
 
 setup(
     name='basepy',
@@ -22,7 +32,7 @@ setup(
     author='Wei Zhuo',
     author_email='zeaphoo@qq.com',
     description='Base library of python 3.6+ and asyncio, include log, config, event, metric etc.',
-    long_description=long_description,
+    long_description=long_description(),
     long_description_content_type="text/markdown",
     packages=packages,
     include_package_data=False,
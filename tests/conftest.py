@@ -0,0 +1,91 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import pytest_asyncio
+
+from basepy.asynclib import install_eager_tasks
+from basepy.asynclog import AsyncLogger
+
+
+def pytest_addoption(parser):
+    parser.addoption("--slow", action="store_true", default=False,
+                     help="run tests marked slow (real sleeps)")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--slow"):
+        return
+    skip_slow = pytest.mark.skip(reason="needs --slow to run")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
+class FakeClock:
+    """A clock running ``1 / scale`` times faster than real time.
+
+    ``sleep(n)`` blocks for ``n * scale`` real seconds and ``monotonic()``
+    advances by ``n`` over that span, so threads sleeping in parallel still
+    overlap as they would on the real clock.
+    """
+    def __init__(self, scale=1.0):
+        self.scale = scale
+        self._sleep = time.sleep
+        self._monotonic = time.monotonic
+
+    def sleep(self, seconds):
+        self._sleep(seconds * self.scale)
+
+    def monotonic(self):
+        return self._monotonic() / self.scale
+
+
+@pytest.fixture
+def fast_sleep(request, monkeypatch):
+    """Patch time.sleep with a FakeClock; tests marked slow keep real time."""
+    scale = 1.0 if request.node.get_closest_marker("slow") else 0.05
+    clock = FakeClock(scale)
+    monkeypatch.setattr(time, "sleep", clock.sleep)
+    return clock
+
+
+@pytest_asyncio.fixture(scope="session", autouse=True)
+async def eager_tasks():
+    install_eager_tasks()
+    yield
+
+
+@pytest.fixture(scope="session")
+def executor():
+    # the worker threads are created once and reaped at process exit
+    return ThreadPoolExecutor(max_workers=8)
+
+
+@pytest_asyncio.fixture(scope="session", autouse=True)
+async def default_executor(executor):
+    asyncio.get_running_loop().set_default_executor(executor)
+    return executor
+
+
+@pytest.fixture(scope="session")
+def stdout_loggers():
+    """Return a factory of loggers with a stdout handler, one per class."""
+    loggers = {}
+
+    def get(logger_cls):
+        logger = loggers.get(logger_cls)
+        if logger is None:
+            logger = loggers[logger_cls] = logger_cls("basepy-test-log")
+            logger.add('stdout')
+        for handler in getattr(logger, 'engine', logger).handlers:
+            handler.reset_buffer()
+        return logger
+
+    return get
+
+
+@pytest.fixture
+def stdout_logger(stdout_loggers):
+    return stdout_loggers(AsyncLogger)
@@ -1,7 +1,63 @@
+import asyncio
+import msgpack
 import pytest
 from basepy.more.fluent import AsyncFluentSender
+from basepy.asynclog import AsyncLogger
 
 @pytest.mark.asyncio
 async def test_fluent_1():
     sender = AsyncFluentSender('debug', 'localhost', '24224')
     await sender.emit("hello", {'key': "value"})
+
+
+@pytest.fixture
+async def fluent_server():
+    received = []
+
+    async def handle(reader, writer):
+        received.append(await reader.read(65536))
+        writer.close()
+
+    server = await asyncio.start_server(handle, '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    yield port, received
+    server.close()
+    await server.wait_closed()
+
+
+async def wait_received(received):
+    for _ in range(100):
+        if received:
+            break
+        await asyncio.sleep(0.01)
+    assert received
+
+
+@pytest.mark.asyncio
+async def test_fluent_batched(fluent_server):
+    port, received = fluent_server
+    sender = AsyncFluentSender('debug', '127.0.0.1', port, flush_interval=0.05)
+    assert await sender.emit("hello", {'key': "value"})
+    assert await sender.emit("world", {'key': "value"})
+    assert received == []
+    await wait_received(received)
+    unpacker = msgpack.Unpacker()
+    unpacker.feed(received[0])
+    assert [tag for tag, _, _ in unpacker] == ['debug.hello', 'debug.world']
+    await sender.close()
+
+
+@pytest.mark.asyncio
+async def test_fluent_handler_flush(fluent_server):
+    port, received = fluent_server
+    logger = AsyncLogger("test_fluent_handler_flush")
+    logger.add('fluent', tag='debug', host='127.0.0.1', port=port,
+               flush_interval=60)
+    await logger.info('hello')
+    assert received == []
+    await logger.flush()
+    await wait_received(received)
+    unpacker = msgpack.Unpacker()
+    unpacker.feed(received[0])
+    assert [tag for tag, _, _ in unpacker] == ['debug.test_fluent_handler_flush']
+    await logger.engine.handlers[0].fluentsender.close()
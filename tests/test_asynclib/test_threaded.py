@@ -4,10 +4,8 @@ import os
 import threading
 import time
 import weakref
-from contextlib import suppress
 from contextlib import contextmanager
 from basepy.asynclib.timeout import timeout
-from concurrent.futures import ThreadPoolExecutor
 from basepy.asynclib.threaded import threaded, threaded_separate, sync_wait_coroutine
 
 import pytest
@@ -21,17 +19,17 @@ except ImportError:
 pytestmark = pytest.mark.asyncio
 
 @pytest.fixture
-def timer():
+def timer(fast_sleep):
     @contextmanager
     def timer(expected_time=0, *, dispersion=0.5):
         expected_time = float(expected_time)
         dispersion_value = expected_time * dispersion
 
-        now = time.monotonic()
+        now = fast_sleep.monotonic()
 
         yield
 
-        delta = time.monotonic() - now
+        delta = fast_sleep.monotonic() - now
 
         lower_bound = expected_time - dispersion_value
         upper_bound = expected_time + dispersion_value
@@ -46,20 +44,7 @@ def threaded_decorator(request, executor):
     return request.param
 
 
-@pytest.fixture
-def executor():
-    thread_pool = ThreadPoolExecutor(max_workers=8)
-    loop = asyncio.get_event_loop()
-    loop.set_default_executor(thread_pool)
-    try:
-        yield thread_pool
-    finally:
-        with suppress(Exception):
-            thread_pool.shutdown(wait=True)
-
-        thread_pool.shutdown(wait=True)
-
-
+@pytest.mark.slow
 async def test_threaded(threaded_decorator, timer):
     sleep = threaded_decorator(time.sleep)
 
@@ -126,13 +111,45 @@ async def test_context_vars(threaded_decorator):
     await asyncio.gather(*futures)
 
 
+@pytest.mark.skipif(contextvars is None, reason="no contextvars support")
+async def test_context_vars_no_copy():
+    ctx_var = contextvars.ContextVar("test", default=None)
+
+    @threaded(copy_context=False)
+    def test():
+        return ctx_var.get()
+
+    ctx_var.set(1)
+    assert await test() is None
+
+
+@pytest.mark.skipif(contextvars is None, reason="no contextvars support")
+async def test_context_vars_forward():
+    ctx_var = contextvars.ContextVar("test")
+    other_var = contextvars.ContextVar("other", default=None)
+
+    @threaded(forward_vars=(ctx_var,))
+    def test(arg):
+        assert other_var.get() is None
+        return ctx_var.get() == arg * arg
+
+    other_var.set(1)
+    futures = []
+
+    for i in range(8):
+        ctx_var.set(i * i)
+        futures.append(test(i))
+
+    assert all(await asyncio.gather(*futures))
+
+
 async def test_wait_coroutine_sync(threaded_decorator):
     loop = asyncio.get_event_loop()
     result = 0
 
     async def coro():
         nonlocal result
-        await asyncio.sleep(1)
+        await asyncio.sleep(0)
         result = 1
 
     @threaded_decorator
@@ -149,7 +166,7 @@ async def test_wait_coroutine_sync_exc(threaded_decorator):
 
     async def coro():
         nonlocal result
-        await asyncio.sleep(1)
+        await asyncio.sleep(0)
         result = 1
         raise RuntimeError("Test")
 
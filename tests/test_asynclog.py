@@ -1,136 +1,75 @@
 
-from basepy.common.log import  LoggerLevel, LogRecord
+from basepy.common.log import BaseHandler
 from basepy.asynclog import AsyncLogger
 import pytest
-import json
 import asyncio
-from basepy.mixins import ToDictMixin
 
 logger = AsyncLogger("basepy-test-log")
 
 
 @pytest.mark.asyncio
-async def test_log(capsys):
-    logger.clear()
-    await logger.info('hello')
-    captured = capsys.readouterr()
-    assert captured.out == ""
-    logger.add('stdout')
-    assert logger.engine.handlers[0].levelno == LoggerLevel.DEBUG
-    assert len(logger.engine.handlers) == 1
-    await logger.info('hello')
-    captured = capsys.readouterr()
-    assert captured.out.endswith("[hello]\n")
-    logger.clear()
-
-@pytest.mark.asyncio
-async def test_log_sync(capsys):
-    logger = AsyncLogger("test_log_sync")
-    logger.clear()
-    logger.add('stdout')
-    await logger.init()
+async def test_log_sync(stdout_logger, capsys):
+    await stdout_logger.init()
 
-    logger = logger.sync()
+    logger = stdout_logger.sync()
     logger.info('info')
-    await asyncio.sleep(0.1)
-    captured = capsys.readouterr()
-    print(captured.out)
-    assert captured.out.endswith("[info]\n")
-
-    logger = logger.sync()
     logger.debug('debug')
-    await asyncio.sleep(0.1)
-    captured = capsys.readouterr()
-    print(captured.out)
-    assert captured.out.endswith("[debug]\n")
-
-    logger = logger.sync()
     logger.warning('warning')
-    await asyncio.sleep(0.1)
-    captured = capsys.readouterr()
-    assert captured.out.endswith("[warning]\n")
-
-    logger = logger.sync()
     logger.critical('critical')
-    await asyncio.sleep(0.1)
-    captured = capsys.readouterr()
-    assert captured.out.endswith("[critical]\n")
-
-    logger = logger.sync()
     logger.error('error')
-    await asyncio.sleep(0.1)
     captured = capsys.readouterr()
-    assert captured.out.endswith("[error]\n")
-    logger.clear()
-    await asyncio.sleep(0.1)
+    lines = captured.out.splitlines()
+    assert len(lines) == 5
+    for line, level in zip(lines, ['info', 'debug', 'warning', 'critical', 'error']):
+        assert line.endswith("[{}]".format(level))
 
 @pytest.mark.asyncio
-async def test_log_level(capsys):
+async def test_log_all_sync(capsys):
     logger.clear()
-    logger.add('stdout', level="INFO")
-    assert len(logger.engine.handlers) == 1
-    assert logger.engine.handlers[0].levelno == LoggerLevel.INFO
-    await logger.info('hello')
+    logger.add('stdout')
+    assert logger.engine.all_sync
+    result = logger.info('hello')
+    assert asyncio.iscoroutine(result)
     captured = capsys.readouterr()
     assert captured.out.endswith("[hello]\n")
-    await logger.debug('hello')
-    captured = capsys.readouterr()
-    assert captured.out == ""
-    await logger.critical('critical')
+    await result
+    await asyncio.create_task(logger.info('world'))
     captured = capsys.readouterr()
-    assert captured.out.endswith("[critical]\n")
+    assert captured.out.endswith("[world]\n")
+    logger.add('socket', host='127.0.0.1', port=9000)
+    assert not logger.engine.all_sync
     logger.clear()
+    assert logger.engine.all_sync
 
 @pytest.mark.asyncio
-async def test_log_2(capsys):
-    logger.clear()
-    logger.add('stdout')
-    await logger.info('hello', data="data", data2={"h":1, "k":2, "x":[1, 2, 3]})
+async def test_log_nowait(stdout_logger, capsys):
+    logger = stdout_logger
+    logger.info_nowait('hello')
+    logger.warning_nowait('warning')
+    await logger.flush()
     captured = capsys.readouterr()
-    #print(captured.out)
-    assert captured.out.find('[data = "data"]') > 1
-    logger.clear()
-
-@pytest.mark.asyncio
-async def test_log_3():
-    logger.clear()
-    logger.add('socket', host='127.0.0.1', port=9000)
-    await logger.info('hello', data="data", data2={"h":1, "k":2, "x":[1, 2, 3]})
-    logger.clear()
-
-class Foo:
-    def __init__(self):
-        self.value = 'foo object'
+    lines = captured.out.splitlines()
+    assert lines[0].endswith("[hello]")
+    assert lines[1].endswith("[warning]")
 
-class FooToJson:
-    def __init__(self):
-        self.value = 'foo to_json'
 
-    def to_json(self):
-        return json.dumps({'class':type(self).__name__, 'value':self.value})
+@pytest.mark.asyncio
+async def test_log_nowait_handler_error(capsys):
+    class FailingHandler(BaseHandler):
+        levelno = 0
 
-class FooWithMixin(ToDictMixin, object):
-    def __init__(self):
-        self.foo= 'foo_with_jsonmixin_foo_value'
-        self.bar = {"bar_bar": {"sub_bar_bar": "subbarbar_with_jsonmixin_subbarbar_value"}}
+        async def emit(self, record):
+            raise RuntimeError(record.msg)
 
-@pytest.mark.asyncio
-async def test_log_have_no_to_json(capsys):
-    logger.clear()
+    logger = AsyncLogger("test_log_nowait_handler_error")
     logger.add('stdout')
-    await logger.info('hello', data="data", data2=Foo())
-    captured = capsys.readouterr()
-    assert captured.out.find('{"value": "foo object"}') > 1
-    await logger.info('hello', data='foo_to_json', data2=FooToJson())
+    logger.engine.handlers.insert(0, FailingHandler())
+    logger.info_nowait('first')
+    await logger.flush()
+    logger.info_nowait('second')
+    await asyncio.wait_for(logger.flush(), 1)
     captured = capsys.readouterr()
-    #print(captured.out)
-    assert captured.out.find('[data = "foo_to_json"]') > 1
-    lr = LogRecord('record', "INFO", "Record Message", [], None, data="record_data", data2=FooWithMixin())
-    data = lr.to_dict()
-    assert isinstance(data['data']['data2'], dict)
-    assert data['data']['data2']['foo'] ==  'foo_with_jsonmixin_foo_value'
-    await logger.info('hello', data='foo_with_jsonmixin', data2=FooWithMixin())
-    captured = capsys.readouterr()
-    #print(captured.out)
-    assert captured.out.find('foo_with_jsonmixin_foo_value') > 1
-    logger.clear()
+    lines = captured.out.splitlines()
+    assert lines[0].endswith("[first]")
+    assert lines[1].endswith("[second]")
+    assert 'RuntimeError' in captured.err
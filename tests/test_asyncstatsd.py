@@ -27,25 +27,25 @@ def statsd_client():
 @pytest.mark.asyncio
 async def test_incr(statsd_client):
     await statsd_client.incr('request.number')
-    assert statsd_client.statsd_data[0] == 'test.request.number:1|c'
+    assert statsd_client.statsd_data[0] == b'test.request.number:1|c'
 
 
 @pytest.mark.asyncio
 async def test_decr(statsd_client):
     await statsd_client.decr('request.number')
-    assert statsd_client.statsd_data[0] == 'test.request.number:-1|c'
+    assert statsd_client.statsd_data[0] == b'test.request.number:-1|c'
 
 
 @pytest.mark.asyncio
 async def test_timing(statsd_client):
     await statsd_client.timing('request.cost', 100)
-    assert statsd_client.statsd_data[0] == 'test.request.cost:100|ms'
+    assert statsd_client.statsd_data[0] == b'test.request.cost:100|ms'
 
 
 @pytest.mark.asyncio
 async def test_gauge(statsd_client):
     await statsd_client.gauge('system.memory', 1000)
-    assert statsd_client.statsd_data[0] == 'test.system.memory:1000|g'
+    assert statsd_client.statsd_data[0] == b'test.system.memory:1000|g'
 
 
 @pytest.mark.asyncio
@@ -56,16 +56,66 @@ async def test_pipeline(statsd_client):
         await pipeline.timing('request.cost', 100)
         await pipeline.gauge('system.memeory', 1000)
     res = (
-        'test.request.number:1|c\n'
-        'test.request.number:-1|c\n'
-        'test.request.cost:100|ms\n'
-        'test.system.memeory:1000|g'
+        b'test.request.number:1|c\n'
+        b'test.request.number:-1|c\n'
+        b'test.request.cost:100|ms\n'
+        b'test.system.memeory:1000|g'
     )
     assert statsd_client.statsd_data[0] == res
 
 
+@pytest.mark.asyncio
+async def test_pipeline_flush(statsd_client):
+    pipeline = statsd_client.pipeline()
+    await pipeline.incr('request.number')
+    await pipeline.flush()
+    assert statsd_client.statsd_data == [b'test.request.number:1|c']
+    pipeline.close()
+    for _ in range(30):
+        await pipeline.incr('request.number')
+    await pipeline.send()
+    # unbuffered clients split pipelines at 512 bytes
+    assert len(statsd_client.statsd_data) == 3
+    assert all(len(data) <= 512 for data in statsd_client.statsd_data)
+
+
 @pytest.mark.asyncio
 async def test_timer(statsd_client):
     async with statsd_client.timer('request.cost'):
         await asyncio.sleep(0.1)
-    assert statsd_client.statsd_data[0].endswith('|ms')
+    assert statsd_client.statsd_data[0].endswith(b'|ms')
+
+
+@pytest.mark.asyncio
+async def test_buffered():
+    client = MockStatsdClient(prefix='test', buffered=True, mtu=60,
+                              flush_interval=0.05)
+    await client.incr('request.number')
+    await client.incr('request.number')
+    assert client.statsd_data == []
+    await client.incr('request.number')
+    assert client.statsd_data == [
+        b'test.request.number:1|c\ntest.request.number:1|c'
+    ]
+    await asyncio.sleep(0.1)
+    assert client.statsd_data[1] == b'test.request.number:1|c'
+
+
+@pytest.mark.asyncio
+async def test_concurrent_init():
+    client = StatsdClient(prefix='test')
+    endpoints = []
+    create = asyncio.get_running_loop().create_datagram_endpoint
+
+    async def counting(*args, **kwargs):
+        endpoints.append(args)
+        return await create(*args, **kwargs)
+
+    client._loop = loop = asyncio.get_running_loop()
+    loop.create_datagram_endpoint = counting
+    try:
+        await asyncio.gather(*[client.incr('request.number') for _ in range(5)])
+    finally:
+        del loop.create_datagram_endpoint
+        client.close()
+    assert len(endpoints) == 1
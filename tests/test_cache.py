@@ -1,19 +1,8 @@
-from datetime import datetime
 import time
 
 from basepy.cache import memoized
 
 
-# timing function execution time
-def timeit(func):
-    def inner(*args, **kwargs):
-        time_1 = datetime.now()
-        rv = func(*args, **kwargs)
-        time_2 = datetime.now()
-        return rv, (time_2-time_1).total_seconds()
-    return inner
-
-
 # not caching function
 def some_function(n):
     """Return the nth fibonacci number."""
@@ -28,7 +17,16 @@ def some_function_2(n):
     return n*2
 
 
-def test_memorized():
+def test_memorized(fast_sleep):
+    # timing function execution time
+    def timeit(func):
+        def inner(*args, **kwargs):
+            time_1 = fast_sleep.monotonic()
+            rv = func(*args, **kwargs)
+            time_2 = fast_sleep.monotonic()
+            return rv, time_2 - time_1
+        return inner
+
     func1 = timeit(some_function)
     func2 = timeit(some_function_2)
     _, t = func1(100)
@@ -37,3 +35,15 @@ def test_memorized():
     assert t >= 1.0
     _, t = func2(1002)
     assert t <= 0.5
+
+
+def test_memoized_maxsize():
+    calls = []
+
+    @memoized(maxsize=2)
+    def double(n):
+        calls.append(n)
+        return n * 2
+
+    assert [double(1), double(2), double(1), double(3), double(2)] == [2, 4, 2, 6, 4]
+    assert calls == [1, 2, 3, 2]
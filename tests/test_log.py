@@ -1,60 +1,75 @@
 
-from basepy.common.log import  LoggerLevel, LogRecord
+from basepy.common.log import  LoggerLevel, LogRecord, _dumps
+import basepy.common.log
+import json
 from basepy.log import Logger
+from basepy.asynclog import AsyncLogger
+import inspect
 import pytest
-import json
 from basepy.mixins import ToDictMixin
 
-logger = Logger("basepy-test-log")
 
+@pytest.fixture(params=[Logger, AsyncLogger])
+def logger(request):
+    logger = request.param("basepy-test-log")
+    yield logger
+    logger.clear()
+
+@pytest.fixture(params=[Logger, AsyncLogger])
+def stdout_logger(request, stdout_loggers):
+    return stdout_loggers(request.param)
+
+def handlers(logger):
+    return getattr(logger, 'engine', logger).handlers
 
-def test_log(capsys):
+async def call(result):
+    # AsyncLogger methods return awaitables, Logger methods return None
+    if inspect.isawaitable(result):
+        await result
+
+
+async def test_log(logger, capsys):
     logger.clear()
-    logger.info('hello')
+    await call(logger.info('hello'))
     captured = capsys.readouterr()
     assert captured.out == ""
     logger.add('stdout')
-    assert logger.handlers[0].levelno == LoggerLevel.DEBUG
-    assert len(logger.handlers) == 1
-    logger.debug('hello')
+    assert handlers(logger)[0].levelno == LoggerLevel.DEBUG
+    assert len(handlers(logger)) == 1
+    await call(logger.debug('hello'))
     captured = capsys.readouterr()
     print(captured.out)
     assert captured.out.endswith("[hello]\n")
-    logger.clear()
 
-def test_log_level(capsys):
+async def test_log_level(logger, capsys):
     logger.clear()
     logger.add('stdout', level="INFO")
-    assert len(logger.handlers) == 1
-    assert logger.handlers[0].levelno == LoggerLevel.INFO
-    logger.info('hello')
+    assert len(handlers(logger)) == 1
+    assert handlers(logger)[0].levelno == LoggerLevel.INFO
+    await call(logger.info('hello'))
     captured = capsys.readouterr()
     assert captured.out.endswith("[hello]\n")
-    logger.debug('hello')
+    await call(logger.debug('hello'))
     captured = capsys.readouterr()
     assert captured.out == ""
-    logger.critical('critical')
+    await call(logger.critical('critical'))
     captured = capsys.readouterr()
     print(captured.out)
     assert captured.out.endswith("[critical]\n")
-    logger.clear()
 
-def test_log_2(capsys):
-    logger.clear()
-    logger.add('stdout')
-    logger.info('hello', data="data", data2={"h":1, "k":2, "x":[1, 2, 3]})
+async def test_log_2(stdout_logger, capsys):
+    logger = stdout_logger
+    await call(logger.info('hello', data="data", data2={"h":1, "k":2, "x":[1, 2, 3]}))
     captured = capsys.readouterr()
     print(captured.out)
     assert captured.out.find('[data = "data"]') > 1
-    logger.clear()
 
-def test_log_3(capsys):
+async def test_log_3(logger, capsys):
     logger.clear()
     logger.add('socket', host='127.0.0.1', port=9000)
-    logger.info('hello', data="data", data2={"h":1, "k":2, "x":[1, 2, 3]})
+    await call(logger.info('hello', data="data", data2={"h":1, "k":2, "x":[1, 2, 3]}))
     captured = capsys.readouterr()
     print(captured.out)
-    logger.clear()
 
 class Foo:
     def __init__(self):
@@ -65,20 +80,19 @@ class FooToJson:
         self.value = 'foo to_json'
 
     def to_json(self):
-        return json.dumps({'class':type(self).__name__, 'value':self.value})
+        return _dumps({'class':type(self).__name__, 'value':self.value})
 
 class FooWithMixin(ToDictMixin, object):
     def __init__(self):
         self.foo= 'foo_with_jsonmixin_foo_value'
         self.bar = {"bar_bar": {"sub_bar_bar": "subbarbar_with_jsonmixin_subbarbar_value"}}
 
-def test_log_have_no_to_json(capsys):
-    logger.clear()
-    logger.add('stdout')
-    logger.info('hello', data="data", data2=Foo())
+async def test_log_have_no_to_json(stdout_logger, capsys):
+    logger = stdout_logger
+    await call(logger.info('hello', data="data", data2=Foo()))
     captured = capsys.readouterr()
     assert captured.out.find('{"value": "foo object"}') > 1
-    logger.info('hello', data='foo_to_json', data2=FooToJson())
+    await call(logger.info('hello', data='foo_to_json', data2=FooToJson()))
     captured = capsys.readouterr()
     #print(captured.out)
     assert captured.out.find('[data = "foo_to_json"]') > 1
@@ -86,8 +100,19 @@ def test_log_have_no_to_json(capsys):
     data = lr.to_dict()
     assert isinstance(data['data']['data2'], dict)
     assert data['data']['data2']['foo'] ==  'foo_with_jsonmixin_foo_value'
-    logger.info('hello', data='foo_with_jsonmixin', data2=FooWithMixin())
+    await call(logger.info('hello', data='foo_with_jsonmixin', data2=FooWithMixin()))
     captured = capsys.readouterr()
     #print(captured.out)
     assert captured.out.find('foo_with_jsonmixin_foo_value') > 1
-    logger.clear()
+
+
+def test_dumps_matches_json():
+    data = {'a': 1, 'b': [1, 2], 'c': 'x'}
+    assert _dumps(data) == json.dumps(data)
+    assert _dumps({1: 'x'}) == json.dumps({1: 'x'})
+    basepy.common.log.use_orjson = True
+    try:
+        assert json.loads(_dumps(data)) == data
+        assert _dumps({1: 'x'}) == json.dumps({1: 'x'})
+    finally:
+        basepy.common.log.use_orjson = False
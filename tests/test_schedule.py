@@ -6,6 +6,7 @@ import mock
 
 from  basepy.schedule import (
     scheduler,
+    Scheduler,
     ScheduleError,
     ScheduleValueError,
 )
@@ -65,3 +66,104 @@ def test_at_time():
     mock_job = make_mock_job()
     with mock_datetime(2022, 3, 2, 20, 32):
         assert scheduler.every(1, 'd').do(mock_job).next_run.hour == 20
+
+
+def test_run_pending():
+    s = Scheduler()
+    mock_job = make_mock_job()
+    with mock.patch("time.monotonic", return_value=1000.0):
+        job = s.every(1, 'm').do(mock_job)
+        s.every(1, 'h').do(mock_job)
+        s.run_pending()
+        assert mock_job.call_count == 0
+        assert s.idle_seconds == 60
+    with mock.patch("time.monotonic", return_value=1060.0):
+        s.run_pending()
+        assert mock_job.call_count == 1
+        assert job.next_run_mono == 1120.0
+        assert s.idle_seconds == 60
+        s.cancel_job(job)
+        assert s.idle_seconds == 3540
+    s.clear()
+    assert s.next_run is None
+
+
+def test_run_pending_exception():
+    s = Scheduler()
+    calls = []
+
+    def failing():
+        calls.append('failing')
+        raise ValueError
+
+    def cancelling():
+        calls.append('cancelling')
+        s.cancel_job(cancelling_job)
+
+    with mock.patch("time.monotonic", return_value=1000.0):
+        cancelling_job = s.every(1, 'm').do(cancelling)
+        s.every(1, 'm').do(failing)
+        s.every(1, 'm').do(make_mock_job())
+    with mock.patch("time.monotonic", return_value=1060.0):
+        try:
+            s.run_pending()
+            assert False
+        except ValueError:
+            pass
+        assert calls == ['cancelling', 'failing']
+        assert len(s.jobs) == 2
+        assert s.idle_seconds == 0
+    with mock.patch("time.monotonic", return_value=1120.0):
+        try:
+            s.run_pending()
+            assert False
+        except ValueError:
+            pass
+        assert calls == ['cancelling', 'failing', 'failing']
+
+
+def test_run_pause_after_job():
+    s = Scheduler()
+    clock = [1000.0]
+
+    def slow_job():
+        clock[0] += 90
+
+    with mock.patch("time.monotonic", lambda: clock[0]):
+        job = s.every(1, 'm').do(slow_job)
+        clock[0] = 1060.0
+        s.run_pending()
+        assert job.last_run_mono == 1150.0
+        assert job.next_run_mono == 1210.0
+
+
+def test_tags():
+    s = Scheduler()
+    mock_job = make_mock_job()
+    job1 = s.every(1, 'm').tag('a', 'b').do(mock_job)
+    job2 = s.every(1, 'h').tag('a').do(mock_job)
+    job3 = s.every(1, 'h').do(mock_job).tag('b')
+    assert s.get_jobs('a') == [job1, job2]
+    assert s.get_jobs('b') == [job1, job3]
+    assert s.get_jobs('c') == []
+    s.cancel_job(job1)
+    assert s.get_jobs('b') == [job3]
+    s.clear('a')
+    assert s.get_jobs() == [job3]
+    assert s.get_jobs('a') == []
+    assert s.get_jobs('b') == [job3]
+
+
+def test_until():
+    mock_job = make_mock_job()
+    with mock_datetime(2022, 3, 2, 20, 32):
+        job = scheduler.every(1, 'h').until("2022-03-03 10:11").do(mock_job)
+        assert job.cancel_after == datetime.datetime(2022, 3, 3, 10, 11)
+        job = scheduler.every(1, 'h').until("22:30:15").do(mock_job)
+        assert job.cancel_after == datetime.datetime(2022, 3, 2, 22, 30, 15)
+        try:
+            scheduler.every(1, 'h').until("2022-03-03 25:00")
+            assert False
+        except ScheduleValueError:
+            pass
+    scheduler.clear()
@@ -0,0 +1,83 @@
+import pytest
+
+from basepy.statsd import StatsdClient
+
+
+class MockStatsdClient(StatsdClient):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.statsd_data = []
+
+    def _send(self, data):
+        self.statsd_data.append(bytes(data))
+
+
+@pytest.fixture
+def statsd_client():
+    host = '127.0.0.1'
+    port = 8125
+    prefix = 'test'
+
+    yield MockStatsdClient(host, port, prefix)
+
+
+def test_incr(statsd_client):
+    statsd_client.incr('request.number')
+    assert statsd_client.statsd_data[0] == b'test.request.number:1|c'
+
+
+def test_decr(statsd_client):
+    statsd_client.decr('request.number')
+    assert statsd_client.statsd_data[0] == b'test.request.number:-1|c'
+
+
+def test_timing(statsd_client):
+    statsd_client.timing('request.cost', 100)
+    assert statsd_client.statsd_data[0] == b'test.request.cost:100|ms'
+
+
+def test_gauge(statsd_client):
+    statsd_client.gauge('system.memory', 1000)
+    statsd_client.gauge('system.memory', 5, delta=True)
+    assert statsd_client.statsd_data == [
+        b'test.system.memory:1000|g',
+        b'test.system.memory:+5|g',
+    ]
+
+
+def test_pipeline(statsd_client):
+    with statsd_client.pipeline() as pipeline:
+        pipeline.incr('request.number')
+        pipeline.decr('request.number')
+        pipeline.timing('request.cost', 100)
+        pipeline.gauge('system.memeory', 1000)
+    res = (
+        b'test.request.number:1|c\n'
+        b'test.request.number:-1|c\n'
+        b'test.request.cost:100|ms\n'
+        b'test.system.memeory:1000|g'
+    )
+    assert statsd_client.statsd_data == [res]
+
+
+def test_buffered():
+    client = MockStatsdClient(prefix='test', buffered=True, mtu=60)
+    client.incr('request.number')
+    client.incr('request.number')
+    assert client.statsd_data == []
+    client.incr('request.number')
+    assert client.statsd_data == [
+        b'test.request.number:1|c\ntest.request.number:1|c'
+    ]
+    client.flush()
+    assert client.statsd_data[1] == b'test.request.number:1|c'
+
+
+def test_rate(statsd_client):
+    statsd_client._random = lambda: 0.9
+    statsd_client.incr('request.number', rate=0.5)
+    assert statsd_client.statsd_data == []
+    statsd_client._random = lambda: 0.1
+    statsd_client.incr('request.number', rate=0.5)
+    assert statsd_client.statsd_data[0] == b'test.request.number:1|c|@0.5'